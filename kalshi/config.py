@@ -4,7 +4,9 @@ Configuration constants, environment loading, and city/series data.
 All trading parameters, risk limits, and static data live here.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 # ── Environment loading ──────────────────────────────────────────────────
 
@@ -12,14 +14,23 @@ BASE_DIR = Path(__file__).parent.parent
 
 
 def _load_env():
-    """Load .env file into os.environ (does not override existing vars)."""
-    env_path = BASE_DIR / ".env"
-    if env_path.exists():
-        for line in env_path.read_text().splitlines():
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                k, v = line.split("=", 1)
-                os.environ.setdefault(k.strip(), v.strip())
+    """Load .env file into os.environ (does not override existing vars).
+
+    Marks the environment once loaded so reimports and child processes,
+    which inherit os.environ, skip re-reading the file.
+    """
+    if os.environ.get("_KALSHI_ENV_LOADED"):
+        return
+    try:
+        lines = (BASE_DIR / ".env").read_text().splitlines()
+    except FileNotFoundError:
+        lines = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            k, v = line.split("=", 1)
+            os.environ.setdefault(k.strip(), v.strip())
+    os.environ["_KALSHI_ENV_LOADED"] = "1"
 
 
 _load_env()
@@ -28,12 +39,14 @@ _load_env()
 
 PAPER_TRADING = os.getenv("PAPER_TRADING", "true").lower() == "true"
 PAPER_TRADING_NOTIFICATIONS = False
+BACKTEST_ENABLED = os.getenv("BACKTEST_ENABLED", "true").lower() == "true"
 
 # ── File paths ───────────────────────────────────────────────────────────
 
 LOG_PATH = BASE_DIR / "kalshi_unified_log.txt"
 STATE_PATH = BASE_DIR / "kalshi_unified_state.json"
 PNL_PATH = BASE_DIR / "kalshi_pnl.json"
+PNL_EVENTS_PATH = BASE_DIR / "kalshi_pnl_events.jsonl"
 PAPER_TRADES_PATH = BASE_DIR / "paper_trades.jsonl"
 BACKTEST_PATH = BASE_DIR / "kalshi_backtest_log.jsonl"
 SETTLEMENT_LOG_PATH = BASE_DIR / "kalshi_settlement_log.jsonl"
@@ -59,6 +72,7 @@ MAX_EDGE_CENTS = 60               # edge sanity cap
 MAX_SPREAD = 30                   # max yes_ask - yes_bid before skipping
 NOAA_STALE_HOURS = 6
 NOAA_STALE_PENALTY = 0.5
+FORECAST_CACHE_TTL = 900          # seconds a scanned forecast is reused
 
 # Paper vs live: paper mode loosens filters for more opportunity volume
 if PAPER_TRADING:
@@ -80,14 +94,18 @@ else:
 
 # ── Risk management ──────────────────────────────────────────────────────
 
-CORRELATION_GROUPS = {
-    'gulf_south': ['HOU', 'NOLA', 'DAL', 'OKC'],
-    'northeast': ['BOS', 'DC'],
-    'pacific': ['SEA', 'SFO'],
-    'southeast': ['ATL'],
-    'desert': ['PHX'],
-    'north_central': ['MIN'],
-}
+# Static lookup tables below are read-only views (MappingProxyType)
+
+CORRELATION_GROUPS = MappingProxyType({
+    'gulf_south': ('HOU', 'NOLA', 'DAL', 'OKC'),
+    'northeast': ('BOS', 'DC'),
+    'pacific': ('SEA', 'SFO'),
+    'southeast': ('ATL',),
+    'desert': ('PHX',),
+    'north_central': ('MIN',),
+})
+# Reverse index (city → group) so lookups don't scan every group
+CITY_TO_GROUP = MappingProxyType({c: g for g, cs in CORRELATION_GROUPS.items() for c in cs})
 MAX_PER_GROUP = 2
 MAX_PER_CITY_DATE = 1
 MAX_DAILY_LOSS_CENTS = 500
@@ -96,7 +114,7 @@ CIRCUIT_BREAKER_ALERT_INTERVAL = 3600  # seconds
 
 # ── City × season standard deviations (°F) ──────────────────────────────
 
-CITY_STD_DEV = {
+CITY_STD_DEV = MappingProxyType({
     'PHX':  {'winter': 0.9, 'spring': 1.1, 'summer': 0.8, 'fall': 0.9},
     'SFO':  {'winter': 1.3, 'spring': 1.5, 'summer': 1.1, 'fall': 1.3},
     'SEA':  {'winter': 1.6, 'spring': 1.5, 'summer': 0.9, 'fall': 1.5},
@@ -108,20 +126,20 @@ CITY_STD_DEV = {
     'OKC':  {'winter': 1.6, 'spring': 1.5, 'summer': 1.1, 'fall': 1.5},
     'ATL':  {'winter': 1.3, 'spring': 1.1, 'summer': 0.9, 'fall': 1.1},
     'MIN':  {'winter': 2.0, 'spring': 1.6, 'summer': 1.1, 'fall': 1.5},
-}
+})
 
 # ── Known model biases (°F): positive = model runs warm ─────────────────
 
-MODEL_BIAS = {
+MODEL_BIAS = MappingProxyType({
     ('NOAA', 'PHX'): 0.0,
     ('OpenMeteo_GFS', 'PHX'): +0.5,
     ('OpenMeteo_GFS', 'BOS'): +1.0,
     ('OpenMeteo_ICON', 'HOU'): -0.8,
-}
+})
 
 # ── City → Kalshi series ticker ──────────────────────────────────────────
 
-SERIES = {
+SERIES = MappingProxyType({
     'PHX':  'KXHIGHTPHX',
     'SFO':  'KXHIGHTSFO',
     'SEA':  'KXHIGHTSEA',
@@ -133,7 +151,7 @@ SERIES = {
     'OKC':  'KXHIGHTOKC',
     'ATL':  'KXHIGHTATL',
     'MIN':  'KXHIGHTMIN',
-}
+})
 
 # ── Telegram ─────────────────────────────────────────────────────────────
 
@@ -143,27 +161,34 @@ TG_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 
 # ── Helpers ──────────────────────────────────────────────────────────────
 
+# Indexed by date.month (slot 0 unused)
+_MONTH_TO_SEASON = (
+    None,
+    'winter', 'winter', 'spring', 'spring', 'spring', 'summer',
+    'summer', 'summer', 'fall', 'fall', 'fall', 'winter',
+)
+
+# Flattened (city, season) → std so lookups are a single dict hit
+_CITY_SEASON_STD = MappingProxyType({
+    (c, s): v for c, seasons in CITY_STD_DEV.items() for s, v in seasons.items()
+})
+
+
 def get_season(date):
     """Return season name for a given date."""
-    month = date.month
-    if month in (12, 1, 2):
-        return 'winter'
-    if month in (3, 4, 5):
-        return 'spring'
-    if month in (6, 7, 8):
-        return 'summer'
-    return 'fall'
+    return _MONTH_TO_SEASON[date.month]
+
+
+@lru_cache(maxsize=256)
+def _std_dev_for_month(city, month):
+    return _CITY_SEASON_STD.get((city, _MONTH_TO_SEASON[month]), FORECAST_STD_DEV)
 
 
 def get_city_std_dev(city, target_date):
     """Get city × season specific standard deviation, with fallback."""
-    season = get_season(target_date)
-    return CITY_STD_DEV.get(city, {}).get(season, FORECAST_STD_DEV)
+    return _std_dev_for_month(city, target_date.month)
 
 
 def get_correlation_group(city):
     """Return the correlation group name for a city."""
-    for group, cities in CORRELATION_GROUPS.items():
-        if city in cities:
-            return group
-    return city
+    return CITY_TO_GROUP.get(city, city)
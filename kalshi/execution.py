@@ -7,7 +7,10 @@ Kelly-criterion sizing.
 """
 import json
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 
 from kalshi.config import (
     PAPER_TRADING,
@@ -23,7 +26,7 @@ from kalshi.config import (
 )
 from kalshi.kalshi_api import get_balance, get_positions, place_order
 from kalshi.probability import kelly_size
-from kalshi.state import load_pnl
+from kalshi.state import load_pnl, pnl_bucket_keys
 from kalshi.logger import log, log_paper_trade
 from kalshi.notifications import notify_trade_opened, notify_system_alert
 
@@ -38,11 +41,11 @@ def check_circuit_breaker(pnl_data, state):
 
     Includes worst-case unrealised exposure from today's open positions.
     """
-    today = datetime.now().strftime("%Y-%m-%d")
-    today_utc = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    week_key = datetime.now().strftime("%Y-W%U")
+    today_utc, week_key = pnl_bucket_keys()
+    # trade_time is an ISO timestamp, so its first 10 chars are the date
+    trade_days = {datetime.now().date().isoformat(), today_utc}
 
-    daily = pnl_data.get('daily', {}).get(today, {})
+    daily = pnl_data.get('daily', {}).get(today_utc, {})
     weekly = pnl_data.get('weeks', {}).get(week_key, {})
 
     daily_pnl = daily.get('pnl_cents', 0)
@@ -51,8 +54,7 @@ def check_circuit_breaker(pnl_data, state):
     today_exposure = sum(
         p.get('count', 0) * p.get('price', 0)
         for p in state.get('positions', [])
-        if p.get('trade_time', '').startswith(today)
-        or p.get('trade_time', '').startswith(today_utc)
+        if p.get('trade_time', '')[:10] in trade_days
     )
 
     effective_daily = daily_pnl - today_exposure
@@ -101,13 +103,23 @@ def execute_trades(opportunities, state):
         state['daily_trades'] = 0
         state['last_trade_date'] = today
 
-    balance = get_balance()
-    event_positions, open_tickers = get_positions()
+    # Independent round trips — overlap them
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_balance = ex.submit(get_balance)
+        f_positions = ex.submit(get_positions)
+    balance = f_balance.result()
+    event_positions, open_tickers = f_positions.result()
     open_count = len([p for p in event_positions if p.get('event_exposure', 0) > 0])
 
     state_tickers = {p['ticker'] for p in state.get('positions', []) if p.get('ticker')}
     all_held = open_tickers | state_tickers
 
+    # Held event tickers bucketed by length so the prefix check below is a
+    # set lookup per distinct length instead of a startswith per ticker
+    open_prefixes = {}
+    for et in open_tickers:
+        open_prefixes.setdefault(len(et), set()).add(et)
+
     log(f"Balance: ${balance/100:.2f} | Positions: {open_count} | Daily: {state['daily_trades']} | Held: {len(all_held)}")
 
     # Existing city+date combos
@@ -120,42 +132,48 @@ def execute_trades(opportunities, state):
         if c and td:
             city_date_traded.add(f"{c}_{td}")
 
+    # Indexes over held positions, maintained incrementally as trades land
+    group_counts = Counter(get_correlation_group(p.get('city', '')) for p in state['positions'])
+    existing_city_date = {(p.get('city'), p.get('target_date')) for p in state['positions']}
+
+    # Loop-invariant limits bound as locals for the per-opportunity loop
+    max_daily = MAX_DAILY_TRADES
+    max_open = MAX_OPEN_POSITIONS
+    max_group = MAX_PER_GROUP
+    max_cost = MAX_COST_PER_TRADE
+
     trades_made = 0
     for opp in opportunities:
-        if state['daily_trades'] >= MAX_DAILY_TRADES:
+        if state['daily_trades'] >= max_daily:
             log("Daily trade limit reached")
             break
-        if open_count + trades_made >= MAX_OPEN_POSITIONS:
+        if open_count + trades_made >= max_open:
             log("Max positions reached")
             break
 
-        opp_ticker = opp['ticker']
-        opp_event = opp.get('event_ticker', '')
+        opp_ticker = opp.ticker
+        opp_event = opp.event_ticker
 
         # Position dedup
         if (opp_ticker in all_held
                 or opp_event in open_tickers
-                or any(opp_ticker.startswith(et) for et in open_tickers)):
+                or any(opp_ticker[:n] in ets for n, ets in open_prefixes.items())):
             log(f"  SKIP {opp_ticker} — already positioned")
             continue
 
         # Correlation-group cap
-        opp_city = opp['city']
+        opp_city = opp.city
         group = get_correlation_group(opp_city)
-        group_count = sum(
-            1 for p in state['positions']
-            if get_correlation_group(p.get('city', '')) == group
-        )
-        if group_count >= MAX_PER_GROUP:
-            log(f"  SKIP {opp_ticker} — group '{group}' at limit ({group_count}/{MAX_PER_GROUP})")
+        group_count = group_counts[group]
+        if group_count >= max_group:
+            log(f"  SKIP {opp_ticker} — group '{group}' at limit ({group_count}/{max_group})")
             continue
 
         # Per-city-per-date dedup
-        opp_target_date = opp.get('target_date')
+        opp_target_date = opp.target_date
         city_date_key = f"{opp_city}_{opp_target_date}" if opp_target_date else ""
         if opp_target_date:
-            existing = {(p.get('city'), p.get('target_date')) for p in state['positions']}
-            if (opp_city, opp_target_date) in existing:
+            if (opp_city, opp_target_date) in existing_city_date:
                 log(f"  SKIP {opp_ticker} — already positioned in {opp_city} for {opp_target_date}")
                 continue
             if city_date_key in city_date_traded:
@@ -164,8 +182,8 @@ def execute_trades(opportunities, state):
 
         # Kelly sizing — use the model's own fair value (not the market-blended
         # one) so that position size reflects the model's actual conviction.
-        price = opp['price']
-        kelly_fair = opp.get('model_fair', opp['fair'])
+        price = opp.price
+        kelly_fair = opp.model_fair
         fair_p = kelly_fair / 100.0
         count = kelly_size(fair_p, price, balance, fraction=0.25)
         if count < 1:
@@ -174,8 +192,8 @@ def execute_trades(opportunities, state):
 
         # Cost cap
         cost_cents = count * price
-        if cost_cents > MAX_COST_PER_TRADE:
-            count = MAX_COST_PER_TRADE // price
+        if cost_cents > max_cost:
+            count = max_cost // price
             if count < 1:
                 log(f"  SKIP {opp_ticker} — cost cap reduces to 0 contracts")
                 continue
@@ -185,35 +203,39 @@ def execute_trades(opportunities, state):
             continue
 
         desc = _describe_contract(opp)
-        log(f"TRADE: {opp['side'].upper()} {count}x {opp_ticker} @ {price}c"
-            f" | fair={opp['fair']}c edge={opp['adjusted_edge']:.1f}c"
-            f" conf={opp['confidence']:.2f} | {desc} (fcst:{opp['forecast']}°F)")
+        log(f"TRADE: {opp.side.upper()} {count}x {opp_ticker} @ {price}c"
+            f" | fair={opp.fair}c edge={opp.adjusted_edge:.1f}c"
+            f" conf={opp.confidence:.2f} | {desc} (fcst:{opp.forecast}°F)")
 
         position_record = {
-            'ticker': opp_ticker, 'side': opp['side'], 'count': count,
-            'price': price, 'fair': opp['fair'],
-            'raw_edge': opp['raw_edge'], 'adjusted_edge': opp['adjusted_edge'],
-            'confidence': opp['confidence'], 'city': opp['city'],
-            'forecast': opp['forecast'],
-            'ensemble_details': opp['ensemble_details'],
-            'fair_cents': opp.get('fair_cents'),
+            'ticker': opp_ticker, 'side': opp.side, 'count': count,
+            'price': price, 'fair': opp.fair,
+            'raw_edge': opp.raw_edge, 'adjusted_edge': opp.adjusted_edge,
+            'confidence': opp.confidence, 'city': opp.city,
+            'forecast': opp.forecast,
+            'ensemble_details': opp.ensemble_details,
+            'fair_cents': opp.fair,
             'trade_time': datetime.now(timezone.utc).isoformat(),
             'city_date': city_date_key,
-            'target_date': opp.get('target_date'),
+            'target_date': opp.target_date,
         }
 
         if PAPER_TRADING:
-            trades_made += _execute_paper(
+            placed = _execute_paper(
                 opp, count, price, total_cost, desc, position_record,
                 state, city_date_traded, all_held, city_date_key,
             )
-            balance -= total_cost
         else:
-            trades_made += _execute_live(
+            placed = _execute_live(
                 opp, count, price, total_cost, desc, position_record,
                 state, city_date_traded, all_held, city_date_key,
             )
-            balance -= total_cost
+        balance -= total_cost
+
+        if placed:
+            group_counts[group] += 1
+            existing_city_date.add((opp_city, opp_target_date))
+        trades_made += placed
 
     return trades_made
 
@@ -221,44 +243,47 @@ def execute_trades(opportunities, state):
 # ── Internal helpers ─────────────────────────────────────────────────────
 
 def _describe_contract(opp):
-    has_floor = opp.get('floor') is not None
-    has_cap = opp.get('cap') is not None
-    if has_cap and not has_floor:
-        return f"{opp['city']} below {opp['cap']}°F"
-    if has_floor and not has_cap:
-        return f"{opp['city']} above {opp['floor']}°F"
-    return f"{opp['city']} {opp.get('floor')}-{opp.get('cap')}°F"
+    return _describe(opp.city, opp.floor, opp.cap)
+
+
+@lru_cache(maxsize=512)
+def _describe(city, floor, cap):
+    if cap is not None and floor is None:
+        return f"{city} below {cap}°F"
+    if floor is not None and cap is None:
+        return f"{city} above {floor}°F"
+    return f"{city} {floor}-{cap}°F"
 
 
 def _execute_paper(opp, count, price, total_cost, desc, position_record,
                    state, city_date_traded, all_held, city_date_key):
-    opp_ticker = opp['ticker']
-    log(f"  PAPER TRADE: Would buy {count}x {opp_ticker} {opp['side']} @ {price}\u00a2 (cost=${total_cost/100:.2f})")
+    opp_ticker = opp.ticker
+    log(f"  PAPER TRADE: Would buy {count}x {opp_ticker} {opp.side} @ {price}\u00a2 (cost=${total_cost/100:.2f})")
 
     log_paper_trade({
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "ticker": opp_ticker,
-        "side": opp['side'],
+        "side": opp.side,
         "price": price,
         "count": count,
         "cost": total_cost,
-        "forecast": opp['forecast'],
-        "fair_cents": opp['fair'],
-        "edge": opp['adjusted_edge'],
-        "confidence": opp['confidence'],
+        "forecast": opp.forecast,
+        "fair_cents": opp.fair,
+        "edge": opp.adjusted_edge,
+        "confidence": opp.confidence,
         "reason": "paper_trade",
-        "settlement_date": opp.get('target_date'),
-        "city": opp['city'],
+        "settlement_date": opp.target_date,
+        "city": opp.city,
         "status": "open",
         "description": desc,
     })
 
-    prov_count = opp['ensemble_details'].get('provider_count', 0)
+    prov_count = opp.ensemble_details.get('provider_count', 0)
     notify_trade_opened({
-        'ticker': opp_ticker, 'side': opp['side'], 'count': count,
-        'price': price, 'description': desc, 'forecast': opp['forecast'],
-        'provider_count': prov_count, 'confidence': opp['confidence'],
-        'edge': opp['adjusted_edge'], 'cost': total_cost, 'is_paper': True,
+        'ticker': opp_ticker, 'side': opp.side, 'count': count,
+        'price': price, 'description': desc, 'forecast': opp.forecast,
+        'provider_count': prov_count, 'confidence': opp.confidence,
+        'edge': opp.adjusted_edge, 'cost': total_cost, 'is_paper': True,
     })
 
     position_record['paper_trade'] = True
@@ -271,18 +296,18 @@ def _execute_paper(opp, count, price, total_cost, desc, position_record,
 
 def _execute_live(opp, count, price, total_cost, desc, position_record,
                   state, city_date_traded, all_held, city_date_key):
-    opp_ticker = opp['ticker']
+    opp_ticker = opp.ticker
     try:
-        result = place_order(opp_ticker, opp['side'], count, price)
+        result = place_order(opp_ticker, opp.side, count, price)
         if 'order' in result:
             order = result['order']
             log(f"  Order {order.get('order_id','?')}: {order.get('status','?')} filled={order.get('filled_count',0)}")
-            prov_count = opp['ensemble_details'].get('provider_count', 0)
+            prov_count = opp.ensemble_details.get('provider_count', 0)
             notify_trade_opened({
-                'ticker': opp_ticker, 'side': opp['side'], 'count': count,
-                'price': price, 'description': desc, 'forecast': opp['forecast'],
-                'provider_count': prov_count, 'confidence': opp['confidence'],
-                'edge': opp['adjusted_edge'], 'cost': total_cost, 'is_paper': False,
+                'ticker': opp_ticker, 'side': opp.side, 'count': count,
+                'price': price, 'description': desc, 'forecast': opp.forecast,
+                'provider_count': prov_count, 'confidence': opp.confidence,
+                'edge': opp.adjusted_edge, 'cost': total_cost, 'is_paper': False,
             })
             state['daily_trades'] += 1
             state['positions'].append(position_record)
@@ -0,0 +1,31 @@
+"""
+JSON encode/decode with optional orjson acceleration.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise.  dumps() always returns compact UTF-8 bytes; dumps_line() adds
+a trailing newline, for JSONL writers.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+if orjson is not None:
+    loads = orjson.loads
+
+    def dumps(obj, default=None):
+        return orjson.dumps(obj, default=default)
+
+    def dumps_line(obj, default=None):
+        return orjson.dumps(obj, default=default, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    loads = json.loads
+
+    def dumps(obj, default=None):
+        return json.dumps(obj, default=default, separators=(',', ':')).encode()
+
+    def dumps_line(obj, default=None):
+        return dumps(obj, default=default) + b"\n"
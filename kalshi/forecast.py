@@ -20,11 +20,11 @@ def get_staleness_adjusted_forecast(city_cfg, target_date, city_code=None):
     Staleness is detected from the NOAA provider's cached updateTime
     (populated during the ensemble call itself) — no extra HTTP request.
 
-    If stale, re-runs the ensemble with a NOAA weight penalty.
+    If stale, NOAA's weight is scaled down and the weighted mean recomputed
+    from the per-provider forecasts already in hand.
 
     Returns (forecast_temp, ensemble_details).
     """
-    # First pass: run ensemble normally (NOAA's updateTime gets cached)
     ensemble_temp, details = weather_ensemble.get_ensemble_forecast(
         city_cfg, target_date,
         city_code=city_code,
@@ -35,14 +35,9 @@ def get_staleness_adjusted_forecast(city_cfg, target_date, city_code=None):
     noaa_age = weather_ensemble.get_noaa_update_age_hours()
     noaa_stale = noaa_age is not None and noaa_age > NOAA_STALE_HOURS
 
-    if noaa_stale:
-        log(f"  NOAA stale ({noaa_age:.1f}h) — re-running ensemble with {NOAA_STALE_PENALTY}x weight penalty")
-        ensemble_temp, details = weather_ensemble.get_ensemble_forecast(
-            city_cfg, target_date,
-            city_code=city_code,
-            model_bias=MODEL_BIAS,
-            weight_overrides={'NOAA': NOAA_STALE_PENALTY},
-        )
+    if noaa_stale and details:
+        log(f"  NOAA stale ({noaa_age:.1f}h) — applying {NOAA_STALE_PENALTY}x weight penalty")
+        ensemble_temp = _apply_weight_penalty(details, 'NOAA', NOAA_STALE_PENALTY)
 
     if details:
         details['noaa_age_hours'] = round(noaa_age, 1) if noaa_age is not None else None
@@ -51,6 +46,18 @@ def get_staleness_adjusted_forecast(city_cfg, target_date, city_code=None):
     return ensemble_temp, details
 
 
+def _apply_weight_penalty(details, provider_name, multiplier):
+    """Scale one provider's weight in *details* and return the re-weighted mean."""
+    forecasts = details['individual_forecasts']
+    weights = details['weights']
+    if provider_name in weights:
+        weights[provider_name] *= multiplier
+    total_weight = sum(weights.values())
+    ensemble_temp = sum(forecasts[name] * weights[name] for name in forecasts) / total_weight
+    details['ensemble_forecast'] = ensemble_temp
+    return ensemble_temp
+
+
 def get_poll_interval():
     """Return a smart polling interval (seconds) based on model-update times."""
     hour = datetime.now().hour
@@ -0,0 +1,20 @@
+"""
+Shared HTTP session.
+
+A single pooled requests.Session used for Kalshi and NOAA calls so
+TCP/TLS connections are kept alive and reused between requests.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POOL_SIZE = 16  # enough for one connection per concurrent city scan
+
+# Retry only covers connection errors and idempotent methods (urllib3's
+# default allowed_methods excludes POST), so orders are never re-sent.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=POOL_SIZE,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+))
@@ -4,17 +4,20 @@ Kalshi REST API client.
 Handles RSA-signed authentication, balance checks, position queries,
 and order placement.  In paper-trading mode the real API is bypassed.
 """
-import json
 import time
 import base64
 
-import requests
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 
 from kalshi.config import KALSHI_BASE, KALSHI_API_KEY_ID, KALSHI_PRIVATE_KEY_PATH, PAPER_TRADING
+from kalshi import fastjson
+from kalshi.http_client import SESSION
 from kalshi.logger import log
 
+if PAPER_TRADING:
+    from paper_trading_safety import paper_get_balance, paper_get_positions, paper_place_order
+
 
 # ── Credentials ──────────────────────────────────────────────────────────
 
@@ -36,21 +39,21 @@ def _load_credentials():
 
 KEY_ID, PRIVATE_KEY = _load_credentials()
 
+# Signing parameters are constant, so build them once
+_PSS = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.DIGEST_LENGTH,
+)
+_SHA256 = hashes.SHA256()
+
 
 # ── Signed request helper ────────────────────────────────────────────────
 
 def kalshi_request(method, path, body=None):
     """Make an authenticated request to the Kalshi API."""
+    method = method.upper()
     ts = str(int(time.time() * 1000))
-    msg = (ts + method.upper() + path).encode()
-    sig = PRIVATE_KEY.sign(
-        msg,
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.DIGEST_LENGTH,
-        ),
-        hashes.SHA256(),
-    )
+    sig = PRIVATE_KEY.sign(f"{ts}{method}{path}".encode(), _PSS, _SHA256)
     headers = {
         'KALSHI-ACCESS-KEY': KEY_ID,
         'KALSHI-ACCESS-SIGNATURE': base64.b64encode(sig).decode(),
@@ -58,13 +61,14 @@ def kalshi_request(method, path, body=None):
         'Content-Type': 'application/json',
     }
     url = KALSHI_BASE + path
-    if method.upper() == 'GET':
-        r = requests.get(url, headers=headers, timeout=15)
-    elif method.upper() == 'POST':
-        r = requests.post(url, headers=headers, json=body, timeout=15)
+    payload = fastjson.dumps(body) if body is not None else None
+    if method == 'GET':
+        r = SESSION.get(url, headers=headers, timeout=15)
+    elif method == 'POST':
+        r = SESSION.post(url, headers=headers, data=payload, timeout=15)
     else:
-        r = requests.request(method.upper(), url, headers=headers, json=body, timeout=15)
-    return r.json()
+        r = SESSION.request(method, url, headers=headers, data=payload, timeout=15)
+    return fastjson.loads(r.content)
 
 
 # ── Balance ──────────────────────────────────────────────────────────────
@@ -81,7 +85,6 @@ def get_real_balance():
 def get_balance():
     """Return simulated balance in paper mode, real balance otherwise."""
     if PAPER_TRADING:
-        from paper_trading_safety import paper_get_balance
         return paper_get_balance()
     return get_real_balance()
 
@@ -91,7 +94,6 @@ def get_balance():
 def get_positions():
     """Return (event_positions, open_event_tickers)."""
     if PAPER_TRADING:
-        from paper_trading_safety import paper_get_positions
         return paper_get_positions()
 
     data = kalshi_request('GET', '/trade-api/v2/portfolio/positions')
@@ -108,7 +110,6 @@ def get_positions():
 def place_order(ticker, side, count, price_cents):
     """Place a limit order (or simulate in paper mode)."""
     if PAPER_TRADING:
-        from paper_trading_safety import paper_place_order
         return paper_place_order(ticker, side, count, price_cents)
 
     body = {
@@ -117,8 +118,9 @@ def place_order(ticker, side, count, price_cents):
         "side": side,
         "type": "limit",
         "count": count,
-        "yes_price": price_cents if side == 'yes' else None,
-        "no_price": price_cents if side == 'no' else None,
     }
-    body = {k: v for k, v in body.items() if v is not None}
+    if side == 'yes':
+        body["yes_price"] = price_cents
+    elif side == 'no':
+        body["no_price"] = price_cents
     return kalshi_request('POST', '/trade-api/v2/portfolio/orders', body)
@@ -1,34 +1,128 @@
 """
 Logging and JSONL file writers for trades, backtests, and settlements.
 """
-import json
+import atexit
+import os
+import threading
+import time
 from datetime import datetime
 
-from kalshi.config import LOG_PATH, MAX_LOG_LINES, BACKTEST_PATH, PAPER_TRADES_PATH
+from kalshi import fastjson
+from kalshi.config import (
+    LOG_PATH, MAX_LOG_LINES, BACKTEST_PATH, PAPER_TRADES_PATH, SETTLEMENT_LOG_PATH,
+)
+
+# Previous log generation, kept when the live file hits MAX_LOG_LINES
+LOG_BACKUP_PATH = LOG_PATH.with_name(LOG_PATH.name + ".1")
+
+# Lines in the live log file (counted once on first write, then tracked)
+_log_lines = None
+_log_fh = None  # line-buffered append handle, reopened after rotation
+
+# Serialises file writes from worker threads (forecast / scan pools)
+_write_lock = threading.Lock()
+
+
+def _count_lines(path):
+    try:
+        with open(path, 'rb') as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
 
 
 def log(msg):
-    """Write a timestamped message to stdout and the rolling log file."""
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{ts}] {msg}"
-    print(line, flush=True)
+    """Write a timestamped message to stdout and the rolling log file.
+
+    The file is rotated to LOG_BACKUP_PATH once it reaches MAX_LOG_LINES,
+    so each call is a single append rather than a read/rewrite.
+    """
+    log_many((msg,))
+
+
+def log_many(msgs):
+    """Log several messages with one stdout write and one file write."""
+    global _log_lines, _log_fh
+    n = datetime.now()
+    ts = f"{n.year:04d}-{n.month:02d}-{n.day:02d} {n.hour:02d}:{n.minute:02d}:{n.second:02d}"
+    text = "".join([f"[{ts}] {msg}\n" for msg in msgs])
+    print(text, end="", flush=True)
     try:
-        with open(LOG_PATH, 'a') as f:
-            f.write(line + "\n")
-        with open(LOG_PATH, 'r') as f:
-            lines = f.readlines()
-        if len(lines) > MAX_LOG_LINES:
-            with open(LOG_PATH, 'w') as f:
-                f.writelines(lines[-MAX_LOG_LINES:])
+        with _write_lock:
+            if _log_fh is None:
+                if _log_lines is None:
+                    _log_lines = _count_lines(LOG_PATH)
+                _log_fh = open(LOG_PATH, 'a', buffering=1)
+            _log_fh.write(text)
+            _log_lines += len(msgs)
+            if _log_lines >= MAX_LOG_LINES:
+                _log_fh.close()
+                _log_fh = None
+                os.replace(LOG_PATH, LOG_BACKUP_PATH)
+                _log_lines = 0
     except Exception as e:
         print(f"[ERROR] Log file write/rotation failed: {e}")
 
 
+# ── JSONL writers ────────────────────────────────────────────────────────
+
+# Long-lived append handles, opened on first write.  Entries are buffered
+# and reach disk when the 64 KiB buffer fills, at most JSONL_FLUSH_INTERVAL
+# seconds after being written, on flush_jsonl() (once per daemon tick), or
+# at exit.
+_jsonl_handles = {}
+JSONL_FLUSH_INTERVAL = 1.0
+_last_jsonl_flush = time.monotonic()
+
+
+def _append_jsonl(path, entry):
+    global _last_jsonl_flush
+    line = fastjson.dumps_line(entry, default=str)
+    with _write_lock:
+        fh = _jsonl_handles.get(path)
+        if fh is None:
+            fh = _jsonl_handles[path] = open(path, 'ab', buffering=1 << 16)
+        fh.write(line)
+        now = time.monotonic()
+        if now - _last_jsonl_flush >= JSONL_FLUSH_INTERVAL:
+            _flush_handles()
+            _last_jsonl_flush = now
+
+
+def _flush_handles():
+    # Caller holds _write_lock
+    for fh in _jsonl_handles.values():
+        try:
+            fh.flush()
+        except Exception as e:
+            print(f"[WARN] Failed to flush {fh.name}: {e}")
+
+
+def flush_jsonl():
+    """Flush buffered JSONL entries to disk."""
+    global _last_jsonl_flush
+    with _write_lock:
+        _flush_handles()
+        _last_jsonl_flush = time.monotonic()
+
+
+@atexit.register
+def _close_files():
+    global _log_fh
+    for fh in [*_jsonl_handles.values(), _log_fh]:
+        try:
+            if fh is not None:
+                fh.close()
+        except Exception:
+            pass
+    _jsonl_handles.clear()
+    _log_fh = None
+
+
 def log_backtest(entry):
     """Append one JSON line to the backtest log."""
     try:
-        with open(BACKTEST_PATH, 'a') as f:
-            f.write(json.dumps(entry, default=str) + "\n")
+        _append_jsonl(BACKTEST_PATH, entry)
     except Exception as e:
         print(f"[WARN] Failed to write backtest entry: {e}")
 
@@ -36,7 +130,14 @@ def log_backtest(entry):
 def log_paper_trade(entry):
     """Append one JSON line to the paper-trades log."""
     try:
-        with open(PAPER_TRADES_PATH, 'a') as f:
-            f.write(json.dumps(entry, default=str) + "\n")
+        _append_jsonl(PAPER_TRADES_PATH, entry)
     except Exception as e:
         print(f"[WARN] Failed to write paper trade entry: {e}")
+
+
+def log_settlement(entry):
+    """Append one JSON line to the settlement log."""
+    try:
+        _append_jsonl(SETTLEMENT_LOG_PATH, entry)
+    except Exception as e:
+        print(f"[WARN] Failed to write settlement entry: {e}")
@@ -2,96 +2,272 @@
 Telegram notification helpers.
 
 Each public function sends a single rich-HTML message for a specific event
-type (trade opened, settlement, daily summary, system alert).
+type (trade opened, settlement, daily summary, system alert).  Messages are
+queued and delivered by a background thread so callers never block on
+Telegram.
 """
+import atexit
+import queue
+import threading
+import time
+from collections import deque
+from typing import NamedTuple, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from kalshi import fastjson
 from kalshi.config import TG_BOT_TOKEN, TG_CHAT_ID, PAPER_TRADING_NOTIFICATIONS
 
+_URL = f"https://api.telegram.org/bot{TG_BOT_TOKEN}/sendMessage"
+_HEADERS = {"Content-Type": "application/json"}
+
+# Keep-alive session so bursts of notifications reuse one TLS connection.
+# 429s are not retried here — the worker reads Telegram's retry_after.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=["POST"],
+    ),
+))
+
 
 def _send(msg):
-    """Low-level Telegram sendMessage wrapper."""
+    """Low-level Telegram sendMessage wrapper.
+
+    Returns Telegram's retry_after (seconds) if the message was rate
+    limited, otherwise None.
+    """
     if not TG_BOT_TOKEN:
-        return
+        return None
     try:
-        requests.post(
-            f"https://api.telegram.org/bot{TG_BOT_TOKEN}/sendMessage",
-            json={"chat_id": TG_CHAT_ID, "text": msg, "parse_mode": "HTML"},
-            timeout=10,
-        )
+        body = fastjson.dumps({"chat_id": TG_CHAT_ID, "text": msg, "parse_mode": "HTML"})
+        r = _SESSION.post(_URL, data=body, headers=_HEADERS, timeout=10)
+        if r.status_code == 429:
+            # Any malformed body still counts as rate limited, so it's retried
+            try:
+                return float(r.json().get('parameters', {}).get('retry_after', 1))
+            except (ValueError, AttributeError, TypeError):
+                return 1.0
     except Exception as e:
         print(f"[WARN] Telegram notification failed: {e}")
+    return None
+
+
+# ── Background delivery ──────────────────────────────────────────────────
+
+_QUEUE = queue.Queue(maxsize=256)
+_MIN_SEND_INTERVAL = 1.0   # seconds between messages to one chat
+_MAX_PER_MINUTE = 20       # Telegram's per-chat limit
+_BATCH_WINDOW = 0.5        # seconds to wait for more messages to coalesce
+_BATCH_MAX_CHARS = 3800    # headroom under Telegram's 4096-char limit
+_BATCH_SEPARATOR = "\n\n\u2500\u2500\u2500\n\n"
+_MAX_RATE_LIMIT_RETRIES = 3
+
+
+def _wait_for_send_slot(sent):
+    """Sleep until another send fits the per-chat rate limits."""
+    now = time.monotonic()
+    while sent and now - sent[0] >= 60:
+        sent.popleft()
+    wait = 0.0
+    if sent:
+        wait = sent[-1] + _MIN_SEND_INTERVAL - now
+    if len(sent) >= _MAX_PER_MINUTE:
+        wait = max(wait, sent[0] + 60 - now)
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _worker():
+    """Drain the queue, coalescing bursts into one message per send."""
+    sent = deque()  # monotonic times of sends in the last minute
+    carry = None    # message that didn't fit in the previous batch
+    while True:
+        batch = [carry if carry is not None else _QUEUE.get()]
+        carry = None
+        size = len(batch[0])
+        while True:
+            try:
+                nxt = _QUEUE.get(timeout=_BATCH_WINDOW)
+            except queue.Empty:
+                break
+            if size + len(_BATCH_SEPARATOR) + len(nxt) > _BATCH_MAX_CHARS:
+                carry = nxt
+                break
+            batch.append(nxt)
+            size += len(_BATCH_SEPARATOR) + len(nxt)
+        try:
+            text = _BATCH_SEPARATOR.join(batch)
+            for _ in range(_MAX_RATE_LIMIT_RETRIES):
+                _wait_for_send_slot(sent)
+                retry_after = _send(text)
+                sent.append(time.monotonic())
+                if retry_after is None:
+                    break
+                # Single sender thread, so sleeping here pauses every send
+                print(f"[WARN] Telegram rate limited — retrying in {retry_after:.0f}s")
+                time.sleep(retry_after)
+        finally:
+            for _ in batch:
+                _QUEUE.task_done()
+
+
+def _enqueue(msg):
+    """Hand a rendered message to the sender thread (never blocks)."""
+    if not TG_BOT_TOKEN:
+        return
+    try:
+        _QUEUE.put_nowait(msg)
+    except queue.Full:
+        print("[WARN] Telegram queue full — dropping notification")
+
+
+@atexit.register
+def _drain(timeout=5.0):
+    """Give queued messages a few seconds to go out before exit."""
+    deadline = time.monotonic() + timeout
+    while _QUEUE.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+
+if TG_BOT_TOKEN:
+    threading.Thread(target=_worker, name="telegram-sender", daemon=True).start()
 
 
 # ── Public notification functions ────────────────────────────────────────
 
+_ALERT_EMOJI = {
+    'info': '\u2139\ufe0f',
+    'warning': '\u26a0\ufe0f',
+    'error': '\U0001f534',
+    'critical': '\U0001f6a8',
+}
+
+
+# Message templates, rendered with a single str.format call each
+_TRADE_OPENED_TMPL = (
+    "{emoji} {label}\n\n"
+    "<b>Contract:</b> {ticker}\n"
+    "<b>Side:</b> {side_upper}\n"
+    "<b>Quantity:</b> {count}x @ {price}\u00a2\n\n"
+    "<b>Details:</b>\n"
+    "\u2022 {description}\n"
+    "\u2022 Forecast: {forecast:.1f}\u00b0F ({provider_count} providers)\n\n"
+    "<b>Analysis:</b>\n"
+    "\u2022 Confidence: {confidence:.0%}\n"
+    "\u2022 Edge: {edge:.1f}\u00a2\n"
+    "\u2022 Cost: ${cost_dollars:.2f}"
+).format
+
+_SETTLEMENT_TMPL = (
+    "{emoji} <b>{label} Settled</b>\n\n"
+    "<b>Contract:</b> {ticker}\n"
+    "<b>Outcome:</b> {outcome}\n"
+    "<b>P&L:</b> ${pnl_dollars:+.2f}"
+    "{temps}"
+    "\n\n{pnl_emoji} <b>{bucket} P&L:</b> ${total_dollars:+.2f}"
+).format
+
+_SETTLEMENT_TEMPS_TMPL = (
+    "\n\n<b>Temperatures:</b>\n"
+    "\u2022 Forecast: {forecast:.1f}\u00b0F\n"
+    "\u2022 Actual: {actual:.1f}\u00b0F\n"
+    "\u2022 Error: {error:.1f}\u00b0F"
+).format
+
+_SETTLEMENT_ACTUAL_TMPL = "\n\u2022 Actual temp: {actual:.1f}\u00b0F".format
+
+_DAILY_SUMMARY_TMPL = (
+    "\U0001f4c5 <b>Daily {label} Summary</b>\n\n"
+    "<b>Date:</b> {date}\n\n"
+    "<b>Activity:</b>\n"
+    "\u2022 Trades: {trades}\n"
+    "\u2022 Record: {wins}W-{losses}L ({win_rate:.0f}%)\n"
+    "\u2022 Daily P&L: ${pnl_dollars:+.2f} {pnl_emoji}\n\n"
+    "<b>Portfolio:</b>\n"
+    "\u2022 Open positions: {open_positions}\n"
+    "\u2022 Balance: ${balance_dollars:.2f}\n"
+    "\u2022 Total P&L: ${total_dollars:+.2f}"
+).format
+
+
+class SettlementRecord(NamedTuple):
+    """One settled position, as passed to notify_settlement()."""
+    ticker: str
+    won: bool
+    pnl_cents: int
+    total_pnl_cents: int
+    is_paper: bool = False
+    actual_temp: Optional[float] = None
+    forecast: Optional[float] = None
+
+
 def notify_trade_opened(data):
     """Send a trade-opened notification.
 
     Expected keys: ticker, side, count, price, description, forecast,
     provider_count, confidence, edge, cost, is_paper.
     """
-    if data.get('is_paper') and not PAPER_TRADING_NOTIFICATIONS:
+    is_paper = data.get('is_paper')
+    if is_paper and not PAPER_TRADING_NOTIFICATIONS:
         return
 
-    emoji = "\U0001f4dd" if data.get('is_paper') else "\u2705"
-    label = "<b>Paper Trade</b>" if data.get('is_paper') else "<b>Trade Executed</b>"
-
-    msg = (
-        f"{emoji} {label}\n\n"
-        f"<b>Contract:</b> {data['ticker']}\n"
-        f"<b>Side:</b> {data['side'].upper()}\n"
-        f"<b>Quantity:</b> {data['count']}x @ {data['price']}\u00a2\n\n"
-        f"<b>Details:</b>\n"
-        f"\u2022 {data['description']}\n"
-        f"\u2022 Forecast: {data['forecast']:.1f}\u00b0F ({data['provider_count']} providers)\n\n"
-        f"<b>Analysis:</b>\n"
-        f"\u2022 Confidence: {data['confidence']:.0%}\n"
-        f"\u2022 Edge: {data['edge']:.1f}\u00a2\n"
-        f"\u2022 Cost: ${data['cost']/100:.2f}"
-    )
-    _send(msg)
-
-
-def notify_settlement(data):
-    """Send a settlement notification.
-
-    Expected keys: ticker, won, pnl_cents, total_pnl_cents, is_paper.
-    Optional: actual_temp, forecast.
-    """
-    if data.get('is_paper') and not PAPER_TRADING_NOTIFICATIONS:
+    _enqueue(_TRADE_OPENED_TMPL(
+        emoji="\U0001f4dd" if is_paper else "\u2705",
+        label="<b>Paper Trade</b>" if is_paper else "<b>Trade Executed</b>",
+        ticker=data['ticker'],
+        side_upper=data['side'].upper(),
+        count=data['count'],
+        price=data['price'],
+        description=data['description'],
+        forecast=data['forecast'],
+        provider_count=data['provider_count'],
+        confidence=data['confidence'],
+        edge=data['edge'],
+        cost_dollars=data['cost'] / 100,
+    ))
+
+
+def notify_settlement(rec):
+    """Send a settlement notification for a SettlementRecord."""
+    is_paper = rec.is_paper
+    if is_paper and not PAPER_TRADING_NOTIFICATIONS:
         return
 
-    won = data['won']
-    emoji = "\U0001f3af" if won else "\U0001f4c9"
-    outcome = "WIN" if won else "LOSS"
-    pnl = data['pnl_cents']
-    label = "Paper Position" if data.get('is_paper') else "Position"
-
-    msg = (
-        f"{emoji} <b>{label} Settled</b>\n\n"
-        f"<b>Contract:</b> {data['ticker']}\n"
-        f"<b>Outcome:</b> {outcome}\n"
-        f"<b>P&L:</b> ${pnl/100:+.2f}"
-    )
-
-    if data.get('actual_temp') and data.get('forecast'):
-        error = abs(data['actual_temp'] - data['forecast'])
-        msg += (
-            f"\n\n<b>Temperatures:</b>\n"
-            f"\u2022 Forecast: {data['forecast']:.1f}\u00b0F\n"
-            f"\u2022 Actual: {data['actual_temp']:.1f}\u00b0F\n"
-            f"\u2022 Error: {error:.1f}\u00b0F"
-        )
-    elif data.get('actual_temp'):
-        msg += f"\n\u2022 Actual temp: {data['actual_temp']:.1f}\u00b0F"
+    won = rec.won
+    total = rec.total_pnl_cents
+    actual = rec.actual_temp
+    forecast = rec.forecast
 
-    total = data['total_pnl_cents']
-    pnl_emoji = "\U0001f4b0" if total >= 0 else "\u26a0\ufe0f"
-    bucket = "Paper" if data.get('is_paper') else "Total"
-    msg += f"\n\n{pnl_emoji} <b>{bucket} P&L:</b> ${total/100:+.2f}"
+    if actual and forecast:
+        temps = _SETTLEMENT_TEMPS_TMPL(
+            forecast=forecast,
+            actual=actual,
+            error=abs(actual - forecast),
+        )
+    elif actual:
+        temps = _SETTLEMENT_ACTUAL_TMPL(actual=actual)
+    else:
+        temps = ""
 
-    _send(msg)
+    _enqueue(_SETTLEMENT_TMPL(
+        emoji="\U0001f3af" if won else "\U0001f4c9",
+        label="Paper Position" if is_paper else "Position",
+        ticker=rec.ticker,
+        outcome="WIN" if won else "LOSS",
+        pnl_dollars=rec.pnl_cents / 100,
+        temps=temps,
+        pnl_emoji="\U0001f4b0" if total >= 0 else "\u26a0\ufe0f",
+        bucket="Paper" if is_paper else "Total",
+        total_dollars=total / 100,
+    ))
 
 
 def notify_daily_summary(data):
@@ -102,25 +278,21 @@ def notify_daily_summary(data):
     """
     trades = data['trades']
     wins = data['wins']
-    losses = data['losses']
-    win_rate = (wins / trades * 100) if trades > 0 else 0
     pnl = data['pnl_cents']
-    pnl_emoji = "\U0001f4c8" if pnl >= 0 else "\U0001f4c9"
-    label = "Paper Trading" if data.get('is_paper') else "Trading"
-
-    msg = (
-        f"\U0001f4c5 <b>Daily {label} Summary</b>\n\n"
-        f"<b>Date:</b> {data['date']}\n\n"
-        f"<b>Activity:</b>\n"
-        f"\u2022 Trades: {trades}\n"
-        f"\u2022 Record: {wins}W-{losses}L ({win_rate:.0f}%)\n"
-        f"\u2022 Daily P&L: ${pnl/100:+.2f} {pnl_emoji}\n\n"
-        f"<b>Portfolio:</b>\n"
-        f"\u2022 Open positions: {data['open_positions']}\n"
-        f"\u2022 Balance: ${data['balance']/100:.2f}\n"
-        f"\u2022 Total P&L: ${data['total_pnl_cents']/100:+.2f}"
-    )
-    _send(msg)
+
+    _enqueue(_DAILY_SUMMARY_TMPL(
+        label="Paper Trading" if data.get('is_paper') else "Trading",
+        date=data['date'],
+        trades=trades,
+        wins=wins,
+        losses=data['losses'],
+        win_rate=(wins / trades * 100) if trades > 0 else 0,
+        pnl_dollars=pnl / 100,
+        pnl_emoji="\U0001f4c8" if pnl >= 0 else "\U0001f4c9",
+        open_positions=data['open_positions'],
+        balance_dollars=data['balance'] / 100,
+        total_dollars=data['total_pnl_cents'] / 100,
+    ))
 
 
 def notify_system_alert(data):
@@ -129,16 +301,10 @@ def notify_system_alert(data):
     Expected keys: level ('info'|'warning'|'error'|'critical'),
     title, message.  Optional: details.
     """
-    emoji_map = {
-        'info': '\u2139\ufe0f',
-        'warning': '\u26a0\ufe0f',
-        'error': '\U0001f534',
-        'critical': '\U0001f6a8',
-    }
-    emoji = emoji_map.get(data.get('level', 'info'), '\u2139\ufe0f')
+    emoji = _ALERT_EMOJI.get(data.get('level', 'info'), _ALERT_EMOJI['info'])
 
     msg = f"{emoji} <b>{data['title']}</b>\n\n{data['message']}"
     if data.get('details'):
         msg += f"\n\n<b>Details:</b>\n{data['details']}"
 
-    _send(msg)
+    _enqueue(msg)
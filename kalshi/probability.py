@@ -6,7 +6,8 @@ fair-probability calculation, confidence scoring, and Kelly criterion.
 """
 import math
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 
 from kalshi.config import (
     FORECAST_STD_DEV,
@@ -25,12 +26,21 @@ MONTH_MAP = {
     'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
 }
 
+# Event-title patterns, compiled once (case-insensitive, so no .lower() copy)
+_MONTH_DAY_RE = re.compile(
+    r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\s+(\d+)', re.IGNORECASE,
+)
+_TODAY_RE = re.compile(r'today', re.IGNORECASE)
+_TOMORROW_RE = re.compile(r'tomorrow', re.IGNORECASE)
+
+_INV_SQRT2 = 0.7071067811865476  # 1 / sqrt(2)
+
 
 # ── Core math ────────────────────────────────────────────────────────────
 
 def normal_cdf(x):
     """Standard normal cumulative distribution function."""
-    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+    return 0.5 * (1.0 + math.erf(x * _INV_SQRT2))
 
 
 def market_adjusted_fair(model_p, market_p, model_weight=MODEL_WEIGHT):
@@ -41,19 +51,14 @@ def market_adjusted_fair(model_p, market_p, model_weight=MODEL_WEIGHT):
     market_p = max(0.02, min(0.98, market_p))
     model_p = max(0.02, min(0.98, model_p))
 
-    def logit(p):
-        return math.log(p / (1 - p))
-
-    def inv_logit(x):
-        return 1 / (1 + math.exp(-x))
-
-    blended = model_weight * logit(model_p) + (1 - model_weight) * logit(market_p)
-    return inv_logit(blended)
+    blended = (model_weight * math.log(model_p / (1.0 - model_p))
+               + (1.0 - model_weight) * math.log(market_p / (1.0 - market_p)))
+    return 1.0 / (1.0 + math.exp(-blended))
 
 
 # ── Confidence scoring ───────────────────────────────────────────────────
 
-def calculate_confidence_score(ensemble_details, forecast_temp, std_dev):
+def calculate_confidence_score(ensemble_details):
     """Score between 0 and 1 based on provider agreement and count."""
     if not ensemble_details or ensemble_details.get('provider_count', 0) < MIN_PROVIDER_COUNT:
         return 0.0
@@ -62,9 +67,16 @@ def calculate_confidence_score(ensemble_details, forecast_temp, std_dev):
     if len(individual) < 2:
         return 0.7  # single-provider base confidence
 
-    forecasts = list(individual.values())
-    mean_f = sum(forecasts) / len(forecasts)
-    forecast_std = math.sqrt(sum((f - mean_f) ** 2 for f in forecasts) / len(forecasts))
+    # Welford's single pass: no intermediate list, no cancellation error
+    n = 0
+    mean_f = 0.0
+    m2 = 0.0
+    for f in individual.values():
+        n += 1
+        delta = f - mean_f
+        mean_f += delta / n
+        m2 += delta * (f - mean_f)
+    forecast_std = math.sqrt(m2 / n)
 
     agreement_score = max(0.5, 1.0 - (forecast_std / 5.0))
     provider_score = min(1.0, len(individual) / 3.0)
@@ -74,24 +86,12 @@ def calculate_confidence_score(ensemble_details, forecast_temp, std_dev):
 
 # ── Fair probability ─────────────────────────────────────────────────────
 
-def fair_probability(forecast_temp, ensemble_details, floor_strike, cap_strike,
-                     city=None, target_date=None, std=FORECAST_STD_DEV,
-                     days_ahead=1, strike_type=None):
-    """Calculate fair probability for a weather contract.
-
-    Uses city × season std-dev and lead-time scaling with the strike geometry
-    (less / greater / between) to compute a CDF-based fair value.
+def lead_time_std(std, days_ahead):
+    """Scale a base std-dev for forecast lead time.
 
-    NOTE: Confidence is intentionally NOT applied here — it is applied once
-    at the scanner level (adjusted_edge = raw_edge * confidence) to avoid
-    double-counting.
+    Depends only on the event (city, date), so scanners compute it once
+    and reuse it for every strike via strike_probability().
     """
-    if not forecast_temp:
-        return 0.5
-
-    if city and target_date:
-        std = get_city_std_dev(city, target_date)
-
     # Lead-time decay: same-day forecasts are much more accurate
     if days_ahead == 0:
         decay = 0.5
@@ -105,18 +105,62 @@ def fair_probability(forecast_temp, ensemble_details, floor_strike, cap_strike,
     if adjusted_std <= 0:
         log(f"ERROR: Invalid adjusted_std={adjusted_std:.4f}, using default 1.0")
         adjusted_std = 1.0
+    return adjusted_std
 
-    if strike_type == 'less':
-        return normal_cdf((cap_strike - forecast_temp) / adjusted_std)
-    elif strike_type == 'greater':
-        return 1.0 - normal_cdf((floor_strike - forecast_temp) / adjusted_std)
-    elif strike_type == 'between':
-        z1 = (floor_strike - forecast_temp) / adjusted_std
-        z2 = (cap_strike - forecast_temp) / adjusted_std
-        return normal_cdf(z2) - normal_cdf(z1)
-    else:
+
+def _p_less(forecast_temp, floor_strike, cap_strike, adjusted_std):
+    return normal_cdf((cap_strike - forecast_temp) / adjusted_std)
+
+
+def _p_greater(forecast_temp, floor_strike, cap_strike, adjusted_std):
+    return 1.0 - normal_cdf((floor_strike - forecast_temp) / adjusted_std)
+
+
+def _p_between(forecast_temp, floor_strike, cap_strike, adjusted_std):
+    # normal_cdf(z2) - normal_cdf(z1), with the constant terms cancelled
+    k = _INV_SQRT2 / adjusted_std
+    return 0.5 * (math.erf((cap_strike - forecast_temp) * k)
+                  - math.erf((floor_strike - forecast_temp) * k))
+
+
+_STRIKE_FNS = {
+    'less': _p_less,
+    'greater': _p_greater,
+    'between': _p_between,
+}
+
+
+def strike_probability(forecast_temp, floor_strike, cap_strike, strike_type, adjusted_std):
+    """CDF-based probability that the high lands in the contract's range."""
+    fn = _STRIKE_FNS.get(strike_type)
+    if fn is None:
         log(f"ERROR: Unknown strike_type={strike_type}, returning 0.5")
         return 0.5
+    return fn(forecast_temp, floor_strike, cap_strike, adjusted_std)
+
+
+def fair_probability(forecast_temp, ensemble_details, floor_strike, cap_strike,
+                     city=None, target_date=None, std=FORECAST_STD_DEV,
+                     days_ahead=1, strike_type=None):
+    """Calculate fair probability for a weather contract.
+
+    Uses city × season std-dev and lead-time scaling with the strike geometry
+    (less / greater / between) to compute a CDF-based fair value.
+
+    NOTE: Confidence is intentionally NOT applied here — it is applied once
+    at the scanner level (adjusted_edge = raw_edge * confidence) to avoid
+    double-counting.
+    """
+    if not forecast_temp:
+        return 0.5
+
+    if city and target_date:
+        std = get_city_std_dev(city, target_date)
+
+    return strike_probability(
+        forecast_temp, floor_strike, cap_strike, strike_type,
+        lead_time_std(std, days_ahead),
+    )
 
 
 # ── Kelly criterion ──────────────────────────────────────────────────────
@@ -130,12 +174,13 @@ def kelly_size(fair_p, market_price_cents, bankroll_cents, fraction=0.25):
         return 0
 
     cost = market_price_cents
-    payout = 100 - cost
-    b = payout / cost
-    q = 1 - fair_p
+    edge = fair_p * 100 - cost
+    if edge <= 0:
+        return 0  # no edge, nothing to size (the common case when scanning)
 
-    f_star = (fair_p * b - q) / b
-    f_safe = max(0, f_star * fraction)
+    # f* = (p*b - q) / b with b = (100 - cost) / cost reduces to
+    # (100p - cost) / (100 - cost)
+    f_safe = edge * fraction / (100.0 - cost)
 
     max_contracts = int((bankroll_cents * f_safe) / cost)
     return max(0, min(max_contracts, MAX_CONTRACTS))
@@ -143,24 +188,37 @@ def kelly_size(fair_p, market_price_cents, bankroll_cents, fraction=0.25):
 
 # ── Contract helpers ─────────────────────────────────────────────────────
 
+@lru_cache(maxsize=4096)
 def detect_contract_type(ticker):
     """Detect if a contract is threshold (T) or bracket (B)."""
-    if '-T' in ticker:
+    # Strike is the last dash segment, e.g. KXHIGHNY-25JAN15-T45 / -B44.5
+    kind = ticker.rpartition('-')[2][:1]
+    if kind == 'T':
         return 'threshold'
-    elif '-B' in ticker:
+    elif kind == 'B':
         return 'bracket'
     return None
 
 
 def parse_event_date(title):
-    """Parse target date from an event title string. Returns datetime or None."""
-    title_lower = title.lower()
-    m = re.search(r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\w*\s+(\d+)', title_lower)
+    """Parse target date from an event title string. Returns datetime or None.
+
+    Results are memoized per (title, calendar day): titles repeat across
+    scans, and relative words like "today" only change at midnight.
+    """
+    return _parse_event_date(title, date.today().toordinal())
+
+
+@lru_cache(maxsize=4096)
+def _parse_event_date(title, today_ordinal):
+    # Everything is derived from the day, not the wall clock, so a cached
+    # result is the same whenever it's read during that day
+    now = datetime.fromordinal(today_ordinal)
+    m = _MONTH_DAY_RE.search(title)
     if m:
-        month_num = MONTH_MAP.get(m.group(1)[:3])
+        month_num = MONTH_MAP.get(m.group(1).lower()[:3])
         day_num = int(m.group(2))
         if month_num:
-            now = datetime.now()
             # Try current year first, then pick the candidate closest to today
             try:
                 candidate = datetime(now.year, month_num, day_num)
@@ -174,9 +232,8 @@ def parse_event_date(title):
             except ValueError:
                 pass
 
-    now = datetime.now()
-    if 'today' in title_lower:
+    if _TODAY_RE.search(title):
         return now
-    if 'tomorrow' in title_lower:
+    if _TOMORROW_RE.search(title):
         return now + timedelta(days=1)
     return None
@@ -6,12 +6,20 @@ forecasts, computes edges, applies filters, and returns a ranked list
 of trading opportunities.
 """
 import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Dict, Optional
 
 from weather_providers import CITY_CONFIGS
 
 from kalshi.config import (
     SERIES,
+    BACKTEST_ENABLED,
+    FORECAST_CACHE_TTL,
     PAPER_TRADING,
     MIN_VOLUME,
     MIN_CONFIDENCE_SCORE,
@@ -25,9 +33,11 @@ from kalshi.config import (
     MODEL_WEIGHT,
     get_city_std_dev,
 )
+from kalshi.http_client import POOL_SIZE
 from kalshi.kalshi_api import kalshi_request
 from kalshi.probability import (
-    fair_probability,
+    lead_time_std,
+    strike_probability,
     calculate_confidence_score,
     market_adjusted_fair,
     detect_contract_type,
@@ -37,16 +47,45 @@ from kalshi.forecast import get_staleness_adjusted_forecast
 from kalshi.logger import log, log_backtest
 
 
+# ── Opportunity record ───────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class Opportunity:
+    """One tradeable side of a contract, as returned by find_opportunities()."""
+    city: str
+    ticker: str
+    event_ticker: str
+    side: str
+    price: int
+    fair: int
+    model_fair: int
+    raw_edge: float
+    adjusted_edge: float
+    confidence: float
+    forecast: float
+    ensemble_details: Dict
+    floor: Optional[float]
+    cap: Optional[float]
+    volume: Optional[int] = None       # filled by caller
+    target_date: Optional[str] = None  # filled by caller
+
+
 # ── Backtest entry builder ───────────────────────────────────────────────
 
 def _bt(ticker, city, forecast, ensemble_details, confidence, fair_cents,
         yes_ask, yes_bid, floor_s, cap_s, raw_edge, adjusted_edge,
         side, price, action, skip_reason=None, days_ahead=None,
         std_dev_used=None, provider_spread=None, model_fair=None,
-        market_price=None, blended_fair=None, strike_type=None):
-    """Build and write a backtest JSONL entry."""
+        market_price=None, blended_fair=None, strike_type=None, ts=None):
+    """Build and write a backtest JSONL entry.
+
+    *ts* is the scan's start time; scanners capture it once rather than
+    reading the clock for every entry.
+    """
+    if not BACKTEST_ENABLED:
+        return
     log_backtest({
-        "ts": datetime.now().isoformat(),
+        "ts": ts or datetime.now().isoformat(),
         "ticker": ticker,
         "city": city,
         "forecast": forecast,
@@ -78,8 +117,9 @@ def _bt(ticker, city, forecast, ensemble_details, confidence, fair_cents,
 def _evaluate_yes_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
                        strike_type, forecast_temp, ensemble_details,
                        confidence, fair_p, model_fair_cents, half_spread,
-                       days_ahead, city_std, provider_spread, event_ticker):
-    """Evaluate the YES side of a contract. Returns an opportunity dict or None."""
+                       days_ahead, city_std, provider_spread, event_ticker,
+                       now_iso):
+    """Evaluate the YES side of a contract. Returns an Opportunity or None."""
     if yes_ask <= 0 or yes_ask >= 95:
         return None
 
@@ -88,7 +128,7 @@ def _evaluate_yes_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             model_fair_cents, yes_ask, yes_bid, floor_s, cap_s,
             None, None, "yes", yes_ask, "skip", f"yes_price_floor={yes_ask}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-            model_fair=model_fair_cents, market_price=yes_ask, strike_type=strike_type)
+            model_fair=model_fair_cents, market_price=yes_ask, strike_type=strike_type, ts=now_iso)
         return None  # fall through to NO side in caller
 
     # Model vs market disagreement (pre-blend)
@@ -99,7 +139,7 @@ def _evaluate_yes_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             model_fair_cents, yes_ask, yes_bid, floor_s, cap_s,
             None, None, "yes", yes_ask, "skip", f"model_disagreement={model_disagreement}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-            model_fair=model_fair_cents, market_price=yes_ask, strike_type=strike_type)
+            model_fair=model_fair_cents, market_price=yes_ask, strike_type=strike_type, ts=now_iso)
         return "skip_contract"  # sentinel: skip entire contract
 
     # Bayesian blend
@@ -116,7 +156,7 @@ def _evaluate_yes_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             None, None, "yes", yes_ask, "skip", f"disagreement={disagreement}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
             model_fair=model_fair_cents, market_price=yes_ask, blended_fair=fair_cents,
-            strike_type=strike_type)
+            strike_type=strike_type, ts=now_iso)
         return "skip_contract"
 
     # Ratio filter
@@ -128,7 +168,7 @@ def _evaluate_yes_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             None, None, "yes", yes_ask, "skip", f"ratio={ratio:.1f}x",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
             model_fair=model_fair_cents, market_price=yes_ask, blended_fair=fair_cents,
-            strike_type=strike_type)
+            strike_type=strike_type, ts=now_iso)
         return "skip_contract"
 
     raw_edge = fair_cents - yes_ask - half_spread
@@ -142,7 +182,7 @@ def _evaluate_yes_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             raw_edge, adjusted_edge, "yes", yes_ask, "skip", f"edge_low={adjusted_edge:.1f}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
             model_fair=model_fair_cents, market_price=yes_ask, blended_fair=fair_cents,
-            strike_type=strike_type)
+            strike_type=strike_type, ts=now_iso)
         return None
 
     if adjusted_edge > MAX_EDGE_CENTS:
@@ -152,7 +192,7 @@ def _evaluate_yes_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             raw_edge, adjusted_edge, "yes", yes_ask, "skip", f"edge_cap={adjusted_edge:.0f}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
             model_fair=model_fair_cents, market_price=yes_ask, blended_fair=fair_cents,
-            strike_type=strike_type)
+            strike_type=strike_type, ts=now_iso)
         return None
 
     _bt(ticker, city, forecast_temp, ensemble_details, confidence,
@@ -160,27 +200,26 @@ def _evaluate_yes_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
         raw_edge, adjusted_edge, "yes", yes_ask, "trade", None,
         days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
         model_fair=model_fair_cents, market_price=yes_ask, blended_fair=fair_cents,
-        strike_type=strike_type)
-
-    return {
-        'city': city, 'ticker': ticker, 'event_ticker': event_ticker,
-        'side': 'yes', 'price': yes_ask,
-        'fair': fair_cents, 'model_fair': model_fair_cents,
-        'raw_edge': raw_edge,
-        'adjusted_edge': adjusted_edge, 'confidence': confidence,
-        'volume': None,  # filled by caller
-        'forecast': forecast_temp,
-        'ensemble_details': ensemble_details,
-        'floor': floor_s, 'cap': cap_s,
-        'target_date': None,  # filled by caller
-    }
+        strike_type=strike_type, ts=now_iso)
+
+    return Opportunity(
+        city=city, ticker=ticker, event_ticker=event_ticker,
+        side='yes', price=yes_ask,
+        fair=fair_cents, model_fair=model_fair_cents,
+        raw_edge=raw_edge,
+        adjusted_edge=adjusted_edge, confidence=confidence,
+        forecast=forecast_temp,
+        ensemble_details=ensemble_details,
+        floor=floor_s, cap=cap_s,
+    )
 
 
 def _evaluate_no_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
                       strike_type, forecast_temp, ensemble_details,
                       confidence, fair_p, model_fair_cents, half_spread,
-                      days_ahead, city_std, provider_spread, event_ticker):
-    """Evaluate the NO side of a contract. Returns an opportunity dict or None."""
+                      days_ahead, city_std, provider_spread, event_ticker,
+                      now_iso):
+    """Evaluate the NO side of a contract. Returns an Opportunity or None."""
     if yes_bid <= 0 or yes_bid <= 5:
         return None
 
@@ -191,7 +230,7 @@ def _evaluate_no_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             model_fair_cents, yes_ask, yes_bid, floor_s, cap_s,
             None, None, "no", no_price, "skip", f"no_price_floor={no_price}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-            model_fair=model_fair_cents, market_price=yes_bid, strike_type=strike_type)
+            model_fair=model_fair_cents, market_price=yes_bid, strike_type=strike_type, ts=now_iso)
         return None
 
     model_fair_no = 100 - model_fair_cents
@@ -202,7 +241,7 @@ def _evaluate_no_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             model_fair_no, yes_ask, yes_bid, floor_s, cap_s,
             None, None, "no", no_price, "skip", f"model_disagreement={model_disagreement}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-            model_fair=model_fair_no, market_price=no_price, strike_type=strike_type)
+            model_fair=model_fair_no, market_price=no_price, strike_type=strike_type, ts=now_iso)
         return None
 
     # Bayesian blend — NO side uses yes_bid (not yes_ask) because buying NO
@@ -220,8 +259,8 @@ def _evaluate_no_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             fair_cents_no, yes_ask, yes_bid, floor_s, cap_s,
             None, None, "no", no_price, "skip", f"disagreement={disagreement}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-            model_fair=100 - model_fair_cents, market_price=no_price, blended_fair=fair_cents_no,
-            strike_type=strike_type)
+            model_fair=model_fair_no, market_price=no_price, blended_fair=fair_cents_no,
+            strike_type=strike_type, ts=now_iso)
         return None
 
     if no_price > 0 and fair_cents_no / no_price > MAX_FAIR_MARKET_RATIO:
@@ -231,22 +270,22 @@ def _evaluate_no_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             fair_cents_no, yes_ask, yes_bid, floor_s, cap_s,
             None, None, "no", no_price, "skip", f"ratio={ratio:.1f}x",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-            model_fair=100 - model_fair_cents, market_price=no_price, blended_fair=fair_cents_no,
-            strike_type=strike_type)
+            model_fair=model_fair_no, market_price=no_price, blended_fair=fair_cents_no,
+            strike_type=strike_type, ts=now_iso)
         return None
 
     raw_edge = yes_bid - fair_cents_yes - half_spread
     adjusted_edge = raw_edge * confidence
 
-    log(f"  {ticker} NO: model={100 - model_fair_cents}\u00a2 market={no_price}\u00a2 blended={fair_cents_no}\u00a2 edge={adjusted_edge:.1f}\u00a2")
+    log(f"  {ticker} NO: model={model_fair_no}\u00a2 market={no_price}\u00a2 blended={fair_cents_no}\u00a2 edge={adjusted_edge:.1f}\u00a2")
 
     if adjusted_edge < MIN_EDGE_CENTS:
         _bt(ticker, city, forecast_temp, ensemble_details, confidence,
             fair_cents_no, yes_ask, yes_bid, floor_s, cap_s,
             raw_edge, adjusted_edge, "no", no_price, "skip", f"edge_low={adjusted_edge:.1f}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-            model_fair=100 - model_fair_cents, market_price=no_price, blended_fair=fair_cents_no,
-            strike_type=strike_type)
+            model_fair=model_fair_no, market_price=no_price, blended_fair=fair_cents_no,
+            strike_type=strike_type, ts=now_iso)
         return None
 
     if adjusted_edge > MAX_EDGE_CENTS:
@@ -255,38 +294,82 @@ def _evaluate_no_side(ticker, city, yes_ask, yes_bid, floor_s, cap_s,
             fair_cents_no, yes_ask, yes_bid, floor_s, cap_s,
             raw_edge, adjusted_edge, "no", no_price, "skip", f"edge_cap={adjusted_edge:.0f}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-            model_fair=100 - model_fair_cents, market_price=no_price, blended_fair=fair_cents_no,
-            strike_type=strike_type)
+            model_fair=model_fair_no, market_price=no_price, blended_fair=fair_cents_no,
+            strike_type=strike_type, ts=now_iso)
         return None
 
     _bt(ticker, city, forecast_temp, ensemble_details, confidence,
         fair_cents_no, yes_ask, yes_bid, floor_s, cap_s,
         raw_edge, adjusted_edge, "no", no_price, "trade", None,
         days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-        model_fair=100 - model_fair_cents, market_price=no_price, blended_fair=fair_cents_no,
-        strike_type=strike_type)
-
-    return {
-        'city': city, 'ticker': ticker, 'event_ticker': event_ticker,
-        'side': 'no', 'price': no_price,
-        'fair': fair_cents_no, 'model_fair': 100 - model_fair_cents,
-        'raw_edge': raw_edge,
-        'adjusted_edge': adjusted_edge, 'confidence': confidence,
-        'volume': None,
-        'forecast': forecast_temp,
-        'ensemble_details': ensemble_details,
-        'floor': floor_s, 'cap': cap_s,
-        'target_date': None,
-    }
+        model_fair=model_fair_no, market_price=no_price, blended_fair=fair_cents_no,
+        strike_type=strike_type, ts=now_iso)
+
+    return Opportunity(
+        city=city, ticker=ticker, event_ticker=event_ticker,
+        side='no', price=no_price,
+        fair=fair_cents_no, model_fair=model_fair_no,
+        raw_edge=raw_edge,
+        adjusted_edge=adjusted_edge, confidence=confidence,
+        forecast=forecast_temp,
+        ensemble_details=ensemble_details,
+        floor=floor_s, cap=cap_s,
+    )
+
+
+# ── Forecast cache ───────────────────────────────────────────────────────
+
+# (city, date_str) -> (temp, details, confidence, provider_spread,
+#                      monotonic time stored).
+# Shared across scans for FORECAST_CACHE_TTL seconds; failed fetches are
+# not cached so they're retried next scan.  Cities are scanned on worker
+# threads, hence the lock.
+_FORECAST_CACHE = OrderedDict()
+_FORECAST_CACHE_MAX = 256
+_forecast_cache_lock = threading.Lock()
+
+
+def _cached_forecast(key):
+    """Return (temp, details, confidence, spread) if cached and fresh, else None."""
+    with _forecast_cache_lock:
+        entry = _FORECAST_CACHE.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[4] >= FORECAST_CACHE_TTL:
+            del _FORECAST_CACHE[key]
+            return None
+        _FORECAST_CACHE.move_to_end(key)
+        return entry[:4]
+
+
+def _store_forecast(key, forecast_temp, ensemble_details, confidence, provider_spread):
+    with _forecast_cache_lock:
+        _FORECAST_CACHE[key] = (
+            forecast_temp, ensemble_details, confidence, provider_spread, time.monotonic(),
+        )
+        _FORECAST_CACHE.move_to_end(key)
+        while len(_FORECAST_CACHE) > _FORECAST_CACHE_MAX:
+            _FORECAST_CACHE.popitem(last=False)
+
+
+def _provider_spread(ensemble_details):
+    """Max - min of the individual provider forecasts, or None if < 2."""
+    vals = ensemble_details.get('individual_forecasts', {}).values()
+    if len(vals) < 2:
+        return None
+    return max(vals) - min(vals)
+
+
+def invalidate_forecast_cache():
+    """Drop all cached forecasts so the next scan fetches fresh ones."""
+    with _forecast_cache_lock:
+        _FORECAST_CACHE.clear()
 
 
 # ── Main scanner ─────────────────────────────────────────────────────────
 
 def find_opportunities():
     """Scan all cities and return a list of trading opportunities, best-edge first."""
-    opportunities = []
-    forecast_cache = {}  # (city, date_str) -> (temp, details, confidence)
-
     if not SERIES:
         log("ERROR: SERIES is empty — no cities configured")
         return []
@@ -294,84 +377,99 @@ def find_opportunities():
         log("ERROR: CITY_CONFIGS is empty — configuration missing")
         return []
 
-    for city, series in SERIES.items():
-        city_cfg = CITY_CONFIGS.get(city)
-        if not city_cfg:
-            log(f"ERROR: No city config for {city}, skipping")
-            continue
+    # Cities are independent and network-bound, so scan them concurrently.
+    # Capped at the HTTP session's pool size so every worker keeps a
+    # warm keep-alive connection.
+    # One clock read per scan, shared by every event and backtest entry
+    now = datetime.now()
+    now_iso = now.isoformat()
 
-        try:
-            data = kalshi_request(
-                'GET',
-                f'/trade-api/v2/events?series_ticker={series}'
-                f'&status=open&with_nested_markets=true&limit=5',
-            )
-            events = data.get('events', [])
+    with ThreadPoolExecutor(max_workers=min(POOL_SIZE, len(SERIES))) as ex:
+        results = list(ex.map(
+            lambda item: _scan_city(*item, now, now_iso), SERIES.items(),
+        ))
 
-            for event in events:
-                _scan_event(city, city_cfg, event, forecast_cache, opportunities)
+    opportunities = [opp for city_opps in results for opp in city_opps]
+    opportunities.sort(key=lambda x: x.adjusted_edge, reverse=True)
+    return opportunities
 
-        except Exception as e:
-            log(f"Error scanning {city}: {e}")
 
-    opportunities.sort(key=lambda x: x['adjusted_edge'], reverse=True)
+def _scan_city(city, series, now, now_iso):
+    """Scan every open event for one city. Returns that city's opportunities."""
+    opportunities = []
+
+    city_cfg = CITY_CONFIGS.get(city)
+    if not city_cfg:
+        log(f"ERROR: No city config for {city}, skipping")
+        return opportunities
+
+    try:
+        data = kalshi_request(
+            'GET',
+            f'/trade-api/v2/events?series_ticker={series}'
+            f'&status=open&with_nested_markets=true&limit=5',
+        )
+        events = data.get('events', [])
+
+        for event in events:
+            _scan_event(city, city_cfg, event, opportunities, now, now_iso)
+
+    except Exception as e:
+        log(f"Error scanning {city}: {e}")
+
     return opportunities
 
 
-def _scan_event(city, city_cfg, event, forecast_cache, opportunities):
+def _scan_event(city, city_cfg, event, opportunities, now, now_iso):
     """Process one Kalshi event (one city/date), appending to *opportunities*."""
     title = event.get('title', '')
     target_date = parse_event_date(title)
     if target_date is None:
         return
 
-    days_ahead = max(0, (target_date.date() - datetime.now().date()).days)
+    days_ahead = max(0, target_date.toordinal() - now.toordinal())
+    target_date_str = target_date.strftime("%Y-%m-%d")
     city_std = get_city_std_dev(city, target_date)
+    adjusted_std = lead_time_std(city_std, days_ahead)
 
-    # ── Forecast (cached per city+date) ──────────────────────────────
-    cache_key = (city, target_date.strftime("%Y-%m-%d"))
-    if cache_key in forecast_cache:
-        forecast_temp, ensemble_details, confidence = forecast_cache[cache_key]
+    # ── Forecast (cached per city+date across scans) ─────────────────
+    cache_key = (city, target_date_str)
+    cached = _cached_forecast(cache_key)
+    if cached is not None:
+        forecast_temp, ensemble_details, confidence, provider_spread = cached
     else:
         ensemble_temp, ensemble_details = get_staleness_adjusted_forecast(city_cfg, target_date, city_code=city)
         if ensemble_temp is None:
-            forecast_cache[cache_key] = (None, None, None)
             return
         forecast_temp = float(ensemble_temp)
         if not ensemble_details or not isinstance(ensemble_details, dict):
-            log(f"ERROR: Invalid ensemble_details for {city} on {target_date.strftime('%Y-%m-%d')}")
-            forecast_cache[cache_key] = (None, None, None)
+            log(f"ERROR: Invalid ensemble_details for {city} on {target_date_str}")
             return
-        confidence = calculate_confidence_score(ensemble_details, forecast_temp, city_std)
-        forecast_cache[cache_key] = (forecast_temp, ensemble_details, confidence)
+        confidence = calculate_confidence_score(ensemble_details)
+        provider_spread = _provider_spread(ensemble_details)
+        _store_forecast(cache_key, forecast_temp, ensemble_details, confidence, provider_spread)
 
-    if forecast_temp is None or confidence < MIN_CONFIDENCE_SCORE:
+    if confidence < MIN_CONFIDENCE_SCORE:
         return
-    forecast_temp = float(forecast_temp)
 
     # Provider-spread hard filter (>6 °F disagreement → skip)
-    individual = ensemble_details.get('individual_forecasts', {})
-    provider_spread = None
-    if len(individual) >= 2:
-        vals = list(individual.values())
-        provider_spread = max(vals) - min(vals)
-        if provider_spread > 6.0:
-            log(f"  SKIP {city} {target_date.strftime('%Y-%m-%d')} — provider spread {provider_spread:.1f}°F > 6°F")
-            return
+    if provider_spread is not None and provider_spread > 6.0:
+        log(f"  SKIP {city} {target_date_str} — provider spread {provider_spread:.1f}°F > 6°F")
+        return
 
     event_ticker = event.get('event_ticker', '')
 
     for m in event.get('markets', []):
         _scan_market(
-            m, city, city_std, event_ticker, target_date, days_ahead,
+            m, city, city_std, adjusted_std, event_ticker, target_date_str, days_ahead,
             forecast_temp, ensemble_details, confidence, provider_spread,
-            opportunities,
+            opportunities, now_iso,
         )
 
 
-def _scan_market(m, city, city_std, event_ticker, target_date, days_ahead,
+def _scan_market(m, city, city_std, adjusted_std, event_ticker, target_date_str, days_ahead,
                  forecast_temp, ensemble_details, confidence,
-                 provider_spread, opportunities):
+                 provider_spread, opportunities, now_iso):
     """Evaluate a single market (contract) for both YES and NO sides."""
     yes_ask = m.get('yes_ask', 0)
     yes_bid = m.get('yes_bid', 0)
@@ -408,7 +506,7 @@ def _scan_market(m, city, city_std, event_ticker, target_date, days_ahead,
             None, yes_ask, yes_bid, floor_s, cap_s, None, None,
             None, None, "skip", f"spread={spread}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-            strike_type=strike_type)
+            strike_type=strike_type, ts=now_iso)
         return
 
     # Strike proximity filter
@@ -427,38 +525,38 @@ def _scan_market(m, city, city_std, event_ticker, target_date, days_ahead,
             None, yes_ask, yes_bid, floor_s, cap_s, None, None,
             None, None, "skip", f"strike_proximity={strike_distance:.1f}",
             days_ahead=days_ahead, std_dev_used=city_std, provider_spread=provider_spread,
-            strike_type=strike_type)
+            strike_type=strike_type, ts=now_iso)
         return
 
-    # Model fair probability (before blending)
-    fair_p = fair_probability(
-        forecast_temp, ensemble_details, floor_s, cap_s,
-        city=city, target_date=target_date, days_ahead=days_ahead,
-        strike_type=strike_type,
-    )
+    # Neither side can trade (and neither would log a backtest entry), so
+    # skip the model math entirely
+    if not (0 < yes_ask < 95 or yes_bid > 5):
+        return
+
+    # Model fair probability (before blending); std is precomputed per event
+    fair_p = strike_probability(forecast_temp, floor_s, cap_s, strike_type, adjusted_std)
     model_fair_cents = round(fair_p * 100)
     half_spread = (yes_ask - yes_bid) / 2 if (yes_ask > 0 and yes_bid > 0) else 0
 
-    common = dict(
-        ticker=ticker, city=city, yes_ask=yes_ask, yes_bid=yes_bid,
-        floor_s=floor_s, cap_s=cap_s, strike_type=strike_type,
-        forecast_temp=forecast_temp, ensemble_details=ensemble_details,
-        confidence=confidence, fair_p=fair_p, model_fair_cents=model_fair_cents,
-        half_spread=half_spread, days_ahead=days_ahead, city_std=city_std,
-        provider_spread=provider_spread, event_ticker=event_ticker,
+    # Positional, in the evaluators' parameter order (no per-market dict)
+    common = (
+        ticker, city, yes_ask, yes_bid, floor_s, cap_s, strike_type,
+        forecast_temp, ensemble_details, confidence, fair_p, model_fair_cents,
+        half_spread, days_ahead, city_std, provider_spread, event_ticker,
+        now_iso,
     )
 
     # Evaluate YES side
-    yes_result = _evaluate_yes_side(**common)
+    yes_result = _evaluate_yes_side(*common)
     if yes_result and yes_result != "skip_contract":
-        yes_result['volume'] = vol
-        yes_result['target_date'] = target_date.strftime("%Y-%m-%d")
+        yes_result.volume = vol
+        yes_result.target_date = target_date_str
         opportunities.append(yes_result)
 
     # Evaluate NO side (skip if YES evaluation said to skip the whole contract)
     if yes_result != "skip_contract":
-        no_result = _evaluate_no_side(**common)
+        no_result = _evaluate_no_side(*common)
         if no_result and no_result != "skip_contract":
-            no_result['volume'] = vol
-            no_result['target_date'] = target_date.strftime("%Y-%m-%d")
+            no_result.volume = vol
+            no_result.target_date = target_date_str
             opportunities.append(no_result)
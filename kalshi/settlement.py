@@ -4,21 +4,27 @@ Settlement checker.
 Polls Kalshi for settled markets, computes P&L, fetches actual observed
 temperatures for the feedback loop, and records everything to JSONL logs.
 """
-import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
-import requests
-
 from weather_providers import CITY_CONFIGS
 
-from kalshi.config import SETTLEMENT_LOG_PATH
+from kalshi import fastjson
+from kalshi.http_client import POOL_SIZE, SESSION
 from kalshi.kalshi_api import kalshi_request
 from kalshi.forecast import weather_ensemble
 from kalshi.probability import MONTH_MAP
 from kalshi.state import record_pnl
-from kalshi.logger import log, log_paper_trade
-from kalshi.notifications import notify_settlement
+from kalshi.logger import log, log_paper_trade, log_settlement
+from kalshi.notifications import SettlementRecord, notify_settlement
+
+
+# Date segment of a market ticker, e.g. KXHIGHNY-25JAN15-T45 → 25, JAN, 15
+_TICKER_DATE_RE = re.compile(
+    r'-(\d{2})(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)(\d{2})-',
+    re.IGNORECASE,
+)
 
 
 # ── NOAA observations for actual high temp ───────────────────────────────
@@ -43,17 +49,18 @@ def fetch_actual_high_temp(city, target_date):
         params = {'start': start_time, 'end': end_time}
         headers = {'User-Agent': 'KaelWeatherBot/2.0'}
 
-        r = requests.get(url, params=params, headers=headers, timeout=15)
+        r = SESSION.get(url, params=params, headers=headers, timeout=15)
         r.raise_for_status()
 
-        temps_f = []
-        for obs in r.json().get('features', []):
+        # °C→°F is monotonic, so take the max first and convert once
+        high_c = None
+        for obs in fastjson.loads(r.content).get('features', []):
             temp_c = obs.get('properties', {}).get('temperature', {}).get('value')
-            if temp_c is not None:
-                temps_f.append((temp_c * 9 / 5) + 32)
+            if temp_c is not None and (high_c is None or temp_c > high_c):
+                high_c = temp_c
 
-        if temps_f:
-            actual_high = max(temps_f)
+        if high_c is not None:
+            actual_high = (high_c * 9 / 5) + 32
             log(f"  Actual high for {city} on {date_str}: {actual_high:.1f}°F")
             return actual_high
 
@@ -68,24 +75,54 @@ def fetch_actual_high_temp(city, target_date):
 
 def check_settled(state):
     """Walk open positions and resolve any that Kalshi has settled."""
-    new_positions = []
+    apply_settlements(state, fetch_settlements(state.get('positions', [])))
 
-    for pos in state.get('positions', []):
-        try:
-            data = kalshi_request('GET', f'/trade-api/v2/markets/{pos["ticker"]}')
-            m = data.get('market', {})
-            result = m.get('result')
 
-            if not result:
-                new_positions.append(pos)
-                continue
+def fetch_settlements(positions):
+    """Do the network half of a settlement check.
 
+    Returns (unsettled, settled) where settled is a list of
+    (position, result, actual_temp).  Touches no shared state, so it can
+    run on a worker thread while the scanner works; hand the result to
+    apply_settlements() on the main thread.
+    """
+    # Market results come from one batched query where possible; NOAA
+    # observation fetches are independent round trips, so overlap them.
+    unsettled = []
+    settled = []
+    actual_temps = []
+    if positions:
+        results = _fetch_market_results(positions)
+        with ThreadPoolExecutor(max_workers=min(POOL_SIZE, len(positions))) as ex:
+            if results is None:
+                results = list(ex.map(_fetch_market_result, positions))
+            for pos, result in zip(positions, results):
+                if result:
+                    settled.append((pos, result))
+                else:
+                    unsettled.append(pos)
+            actual_temps = list(ex.map(_fetch_actual_temp, [pos for pos, _ in settled]))
+
+    return unsettled, [(pos, result, temp) for (pos, result), temp in zip(settled, actual_temps)]
+
+
+def apply_settlements(state, fetched):
+    """Record P&L, logs and accuracy for positions fetch_settlements() resolved.
+
+    State, logs and accuracy history are only touched here, in position
+    order.
+    """
+    unsettled, settled = fetched
+    new_positions = list(unsettled)
+
+    for pos, result, actual_temp in settled:
+        try:
             is_paper = pos.get('paper_trade', False)
             won = (result == pos['side'])
             pnl = (100 - pos['price']) * pos['count'] if won else -(pos['price'] * pos['count'])
             state['total_pnl_cents'] = state.get('total_pnl_cents', 0) + pnl
 
-            actual_temp = _fetch_and_record_accuracy(pos)
+            _record_accuracy(pos, actual_temp)
 
             _log_settlement(pos, result, won, pnl, actual_temp, is_paper)
             _log_paper_settlement(pos, result, won, pnl, actual_temp, is_paper)
@@ -95,15 +132,15 @@ def check_settled(state):
             log(f"{trade_type}SETTLED: {pos['ticker']} -> {'WIN' if won else 'LOSS'}"
                 f" ${pnl/100:.2f} (total: ${state['total_pnl_cents']/100:.2f}){actual_str}")
 
-            notify_settlement({
-                'ticker': pos['ticker'],
-                'won': won,
-                'pnl_cents': pnl,
-                'total_pnl_cents': state['total_pnl_cents'],
-                'actual_temp': actual_temp,
-                'forecast': pos.get('forecast'),
-                'is_paper': is_paper,
-            })
+            notify_settlement(SettlementRecord(
+                ticker=pos['ticker'],
+                won=won,
+                pnl_cents=pnl,
+                total_pnl_cents=state['total_pnl_cents'],
+                is_paper=is_paper,
+                actual_temp=actual_temp,
+                forecast=pos.get('forecast'),
+            ))
 
             record_pnl(pnl, pos['ticker'])
 
@@ -123,10 +160,7 @@ def _parse_settlement_date(pos):
     field so settlement still works if Kalshi changes their ticker format.
     """
     ticker = pos.get('ticker', '')
-    date_match = re.search(
-        r'-(\d{2})(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)(\d{2})-',
-        ticker, re.IGNORECASE,
-    )
+    date_match = _TICKER_DATE_RE.search(ticker)
     if date_match:
         month_str = date_match.group(2).lower()[:3]
         month = MONTH_MAP.get(month_str)
@@ -142,7 +176,7 @@ def _parse_settlement_date(pos):
     target_date_str = pos.get('target_date')
     if target_date_str:
         try:
-            return datetime.strptime(target_date_str, "%Y-%m-%d")
+            return datetime.fromisoformat(target_date_str)
         except ValueError:
             pass
 
@@ -150,8 +184,46 @@ def _parse_settlement_date(pos):
     return None
 
 
-def _fetch_and_record_accuracy(pos):
-    """Try to fetch actual temp and record per-provider accuracy. Returns temp or None."""
+_MARKETS_BATCH_SIZE = 100  # tickers per /markets query (the endpoint's page size)
+
+
+def _fetch_market_results(positions):
+    """Look up every position's market result via batched /markets queries.
+
+    Returns one result (or None if unsettled) per position, or None if a
+    batch query failed and the caller should fall back to per-ticker
+    lookups.
+    """
+    tickers = list(dict.fromkeys(p['ticker'] for p in positions if p.get('ticker')))
+    by_ticker = {}
+    try:
+        for i in range(0, len(tickers), _MARKETS_BATCH_SIZE):
+            chunk = tickers[i:i + _MARKETS_BATCH_SIZE]
+            data = kalshi_request(
+                'GET', f'/trade-api/v2/markets?tickers={",".join(chunk)}&limit={len(chunk)}',
+            )
+            if 'markets' not in data:
+                raise ValueError(data.get('error', 'no markets in response'))
+            for m in data['markets']:
+                by_ticker[m.get('ticker')] = m.get('result')
+    except Exception as e:
+        log(f"  Batched market lookup failed ({e}), checking positions one by one")
+        return None
+    return [by_ticker.get(p.get('ticker')) for p in positions]
+
+
+def _fetch_market_result(pos):
+    """Return the market's result ('yes'/'no'), or None if unsettled or on error."""
+    try:
+        data = kalshi_request('GET', f'/trade-api/v2/markets/{pos["ticker"]}')
+        return data.get('market', {}).get('result')
+    except Exception as e:
+        log(f"ERROR checking settlement for {pos.get('ticker', '?')}: {e}")
+        return None
+
+
+def _fetch_actual_temp(pos):
+    """Fetch the observed high for a settled position. Returns temp or None."""
     city = pos.get('city')
     if not city or 'ticker' not in pos:
         return None
@@ -160,19 +232,24 @@ def _fetch_and_record_accuracy(pos):
         settlement_date = _parse_settlement_date(pos)
         if settlement_date is None:
             return None
+        return fetch_actual_high_temp(city, settlement_date)
+    except Exception as e:
+        log(f"  Error in feedback loop for {pos.get('ticker', '?')}: {e}")
+        return None
 
-        actual_temp = fetch_actual_high_temp(city, settlement_date)
 
-        if actual_temp is not None:
-            individual = pos.get('ensemble_details', {}).get('individual_forecasts', {})
-            for provider_name, forecast_value in individual.items():
-                weather_ensemble.record_accuracy(provider_name, forecast_value, actual_temp)
-                log(f"  Recorded {provider_name}: predicted={forecast_value:.1f}°F actual={actual_temp:.1f}°F")
+def _record_accuracy(pos, actual_temp):
+    """Record per-provider forecast accuracy against the observed high."""
+    if actual_temp is None:
+        return
 
-        return actual_temp
+    try:
+        individual = pos.get('ensemble_details', {}).get('individual_forecasts', {})
+        for provider_name, forecast_value in individual.items():
+            weather_ensemble.record_accuracy(provider_name, forecast_value, actual_temp)
+            log(f"  Recorded {provider_name}: predicted={forecast_value:.1f}°F actual={actual_temp:.1f}°F")
     except Exception as e:
         log(f"  Error in feedback loop for {pos.get('ticker', '?')}: {e}")
-        return None
 
 
 def _log_settlement(pos, result, won, pnl, actual_temp, is_paper):
@@ -198,11 +275,7 @@ def _log_settlement(pos, result, won, pnl, actual_temp, is_paper):
         "actual_temp": actual_temp,
         "paper_trade": is_paper,
     }
-    try:
-        with open(SETTLEMENT_LOG_PATH, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
-    except Exception as e:
-        log(f"  Error writing settlement log: {e}")
+    log_settlement(entry)
 
 
 def _log_paper_settlement(pos, result, won, pnl, actual_temp, is_paper):
@@ -3,17 +3,87 @@ Persistent state and P&L tracking.
 
 Handles loading/saving the position state file and the P&L ledger.
 """
-import json
-from datetime import datetime
-
-from kalshi.config import STATE_PATH, PNL_PATH
+import atexit
+import os
+import threading
+from datetime import date, datetime, timezone
+from functools import lru_cache
+
+from kalshi import fastjson
+from kalshi.config import STATE_PATH, PNL_PATH, PNL_EVENTS_PATH
+
+
+def _write_atomic(path, data):
+    """Write *data* via a temp file and rename, so a crash never leaves a
+    half-written JSON file behind."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ── Background writer ────────────────────────────────────────────────────
+
+# State snapshots are serialised on the caller's thread and written (with
+# the fsync) by a single writer thread.  Only the newest pending snapshot
+# per path is kept: an older one would be overwritten straight away, and
+# a snapshot identical to the last one queued is not written at all.
+_pending_writes = {}   # path -> newest unwritten payload
+_last_payloads = {}    # path -> last payload queued
+_writes_in_flight = False
+_write_cond = threading.Condition()
+_writer = None
+
+
+def _writer_loop():
+    global _writes_in_flight
+    while True:
+        with _write_cond:
+            while not _pending_writes:
+                _write_cond.wait()
+            batch = list(_pending_writes.items())
+            _pending_writes.clear()
+            _writes_in_flight = True
+        for path, data in batch:
+            try:
+                _write_atomic(path, data)
+            except Exception as e:
+                print(f"[ERROR] Failed to write {path.name}: {e}")
+                with _write_cond:
+                    _last_payloads.pop(path, None)  # let the next save retry
+        with _write_cond:
+            _writes_in_flight = False
+            _write_cond.notify_all()
+
+
+def _write_async(path, data):
+    global _writer
+    with _write_cond:
+        if _last_payloads.get(path) == data:
+            return
+        _last_payloads[path] = data
+        if _writer is None:
+            _writer = threading.Thread(target=_writer_loop, name="state-writer", daemon=True)
+            _writer.start()
+        _pending_writes[path] = data
+        _write_cond.notify_all()
+
+
+@atexit.register
+def flush_writes():
+    """Block until every queued write has reached disk."""
+    with _write_cond:
+        while _pending_writes or _writes_in_flight:
+            _write_cond.wait()
 
 
 # ── Position state ───────────────────────────────────────────────────────
 
 def load_state():
     if STATE_PATH.exists():
-        return json.load(open(STATE_PATH))
+        return fastjson.loads(STATE_PATH.read_bytes())
     return {
         "positions": [],
         "daily_trades": 0,
@@ -23,39 +93,142 @@ def load_state():
 
 
 def save_state(state):
-    with open(STATE_PATH, 'w') as f:
-        json.dump(state, f, indent=2)
+    _write_async(STATE_PATH, fastjson.dumps(state))
 
 
 # ── P&L ledger ───────────────────────────────────────────────────────────
 
+# Settlements are appended to PNL_EVENTS_PATH as they happen; PNL_PATH
+# holds the aggregate up to event "last_event_seq".  The aggregate is
+# rebuilt (snapshot + newer events) on first load and then kept in memory.
+# compact_pnl() folds the event log back into the snapshot at startup,
+# on the first tick of each UTC day, on shutdown, and whenever the log
+# grows past PNL_COMPACT_BYTES, so PNL_PATH is never more than a day stale.
+PNL_COMPACT_BYTES = 1 << 20
+
+_pnl_cache = None
+_last_compact_day = None
+_pnl_events_fh = None  # unbuffered append handle, opened on first record
+
+
+def _pnl_events_file():
+    global _pnl_events_fh
+    if _pnl_events_fh is None:
+        _pnl_events_fh = open(PNL_EVENTS_PATH, 'ab', buffering=0)
+    return _pnl_events_fh
+
+
 def load_pnl():
-    if PNL_PATH.exists():
-        return json.load(open(PNL_PATH))
-    return {"weeks": {}, "daily": {}}
+    """Return the P&L ledger (rebuilt from disk on first use, then cached)."""
+    global _pnl_cache
+    if _pnl_cache is None:
+        if PNL_PATH.exists():
+            pnl = fastjson.loads(PNL_PATH.read_bytes())
+        else:
+            pnl = {"weeks": {}, "daily": {}}
+        _replay_pnl_events(pnl)
+        _pnl_cache = pnl
+    return _pnl_cache
 
 
 def save_pnl(pnl):
-    with open(PNL_PATH, 'w') as f:
-        json.dump(pnl, f, indent=2)
+    global _pnl_cache
+    _write_atomic(PNL_PATH, fastjson.dumps(pnl))
+    _pnl_cache = pnl
+
+
+def compact_pnl(min_bytes=PNL_COMPACT_BYTES):
+    """Fold the event log into the snapshot.
+
+    Runs once the log reaches *min_bytes*, and otherwise on the first call
+    of each UTC day.  Pass min_bytes=0 to fold whatever is pending.
+    """
+    global _last_compact_day
+    try:
+        size = PNL_EVENTS_PATH.stat().st_size
+    except FileNotFoundError:
+        return
+    today = pnl_bucket_keys()[0]
+    if not size or (size < min_bytes and today == _last_compact_day):
+        return
+    # Snapshot first: if we die before truncating, replay skips the events
+    # it already covers by sequence number.
+    save_pnl(load_pnl())
+    _pnl_events_file().truncate(0)
+    _last_compact_day = today
+
+
+def _replay_pnl_events(pnl):
+    try:
+        with open(PNL_EVENTS_PATH, 'rb') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+    last_seq = pnl.get("last_event_seq", 0)
+    for line in lines:
+        try:
+            event = fastjson.loads(line)
+        except ValueError:
+            continue  # blank or torn line from an interrupted append
+        if event["seq"] <= last_seq:
+            continue
+        _apply_pnl(pnl, event["amount_cents"], event["daily"], event["week"])
+        last_seq = event["seq"]
+    pnl["last_event_seq"] = last_seq
+
+
+_EMPTY_BUCKET = {"pnl_cents": 0, "trades": 0, "wins": 0, "losses": 0}
+
+
+def _apply_pnl(pnl, amount_cents, day_key, week_key):
+    outcome = "wins" if amount_cents > 0 else "losses"
+    _add_to_bucket(pnl["daily"], day_key, amount_cents, outcome)
+    _add_to_bucket(pnl["weeks"], week_key, amount_cents, outcome)
+
+
+def _add_to_bucket(buckets, key, amount_cents, outcome):
+    bucket = buckets.get(key)
+    if bucket is None:
+        bucket = buckets[key] = _EMPTY_BUCKET.copy()
+    bucket["pnl_cents"] += amount_cents
+    bucket["trades"] += 1
+    bucket[outcome] += 1
+
+
+def pnl_bucket_keys():
+    """(daily, weekly) ledger keys for the current UTC day.
+
+    Daily keys are ISO dates, weekly keys ISO weeks such as "2025-W03".
+    """
+    return _bucket_keys(datetime.now(timezone.utc).toordinal())
+
+
+@lru_cache(maxsize=8)
+def _bucket_keys(day_ordinal):
+    """Ledger keys for a day; formatted once per day."""
+    d = date.fromordinal(day_ordinal)
+    iso_year, iso_week, _ = d.isocalendar()
+    return d.isoformat(), f"{iso_year}-W{iso_week:02d}"
 
 
 def record_pnl(amount_cents, ticker):
-    """Record a settlement result in both daily and weekly buckets."""
+    """Record a settlement result in both daily and weekly buckets.
+
+    Appends one line to the event log and updates the in-memory ledger.
+    """
     pnl = load_pnl()
-    today = datetime.now().strftime("%Y-%m-%d")
-    week_key = datetime.now().strftime("%Y-W%U")
-
-    for bucket_key, bucket_name in [(today, "daily"), (week_key, "weeks")]:
-        if bucket_key not in pnl[bucket_name]:
-            pnl[bucket_name][bucket_key] = {
-                "pnl_cents": 0, "trades": 0, "wins": 0, "losses": 0,
-            }
-        pnl[bucket_name][bucket_key]["pnl_cents"] += amount_cents
-        pnl[bucket_name][bucket_key]["trades"] += 1
-        if amount_cents > 0:
-            pnl[bucket_name][bucket_key]["wins"] += 1
-        else:
-            pnl[bucket_name][bucket_key]["losses"] += 1
+    today, week_key = pnl_bucket_keys()
+    seq = pnl.get("last_event_seq", 0) + 1
+
+    event = {
+        "seq": seq,
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "ticker": ticker,
+        "amount_cents": amount_cents,
+        "daily": today,
+        "week": week_key,
+    }
+    _pnl_events_file().write(fastjson.dumps_line(event))
 
-    save_pnl(pnl)
+    _apply_pnl(pnl, amount_cents, today, week_key)
+    pnl["last_event_seq"] = seq
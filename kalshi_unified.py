@@ -11,32 +11,61 @@ Runs an infinite loop that:
 All heavy lifting lives in the `kalshi/` package — this file is just
 the orchestrator.
 """
-import time
+import signal
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 from kalshi.config import PAPER_TRADING, SERIES, MIN_EDGE_CENTS, MIN_CONFIDENCE_SCORE
-from kalshi.kalshi_api import get_real_balance
-from kalshi.forecast import weather_ensemble, get_poll_interval
-from kalshi.scanner import find_opportunities
-from kalshi.execution import execute_trades
-from kalshi.settlement import check_settled
-from kalshi.state import load_state, save_state
-from kalshi.logger import log
+from kalshi.state import load_state, save_state, flush_writes, compact_pnl
+from kalshi.logger import log, log_many, flush_jsonl
+
+
+_CITY_LIST = ', '.join(sorted(SERIES))
+
+# Set by SIGTERM/SIGINT; wakes the poll sleep so the daemon exits promptly
+_stop = threading.Event()
+_stop_signal = None
+
+
+def _request_stop(signum, frame):
+    # No I/O here: the signal may land while the main thread holds the
+    # logger's lock or is mid-print, so just record it and wake the loop
+    global _stop_signal
+    _stop_signal = signum
+    _stop.set()
 
 
 def main():
+    # Imported here rather than at module level: kalshi_api loads the API
+    # key and forecast builds the provider ensemble on import, none of
+    # which is needed until the daemon actually starts
+    from kalshi.kalshi_api import get_real_balance
+    from kalshi.forecast import weather_ensemble, get_poll_interval
+    from kalshi.scanner import find_opportunities, invalidate_forecast_cache
+    from kalshi.execution import execute_trades
+    from kalshi.settlement import fetch_settlements, apply_settlements
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
     log("=" * 70)
     if PAPER_TRADING:
         log("PAPER TRADING MODE ACTIVE — no real money at risk")
     log(f"Unified Kalshi Weather Daemon — {len(SERIES)} cities")
     log(f"Providers: {len(weather_ensemble.providers)} | "
         f"Min edge: {MIN_EDGE_CENTS}c | Min confidence: {MIN_CONFIDENCE_SCORE}")
-    log(f"Cities: {', '.join(sorted(SERIES.keys()))}")
+    log(f"Cities: {_CITY_LIST}")
 
-    state = load_state()
+    # Settlement lookups are network-bound and independent of the scan, so
+    # they run on this worker while find_opportunities() does its own I/O
+    io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="settlement")
 
     # Always fetch real balance (even in paper mode) for reference
-    real_balance = get_real_balance()
+    balance_future = io_pool.submit(get_real_balance)
+    state = load_state()
+    compact_pnl(0)  # bring kalshi_pnl.json up to date with any logged events
+    real_balance = balance_future.result()
     state['balance'] = real_balance
 
     if PAPER_TRADING:
@@ -47,33 +76,61 @@ def main():
     else:
         log(f"Account balance: ${real_balance/100:.2f}")
 
-    while True:
+    last_interval = poll_msg = None
+    while not _stop.is_set():
         try:
-            check_settled(state)
-            save_state(state)
+            # Snapshot the list: nothing adds positions until execute_trades
+            settling = io_pool.submit(fetch_settlements, list(state.get('positions', [])))
+            try:
+                opps = find_opportunities()
+            finally:
+                apply_settlements(state, settling.result())
+                # P&L events are already on disk; persist the removed
+                # positions before trading so a crash can't settle them twice
+                save_state(state)
+                flush_writes()
 
-            opps = find_opportunities()
             if opps:
-                log(f"Found {len(opps)} opportunities "
-                    f"(best: {opps[0]['city']} edge={opps[0]['adjusted_edge']:.1f}c)")
-                for i, o in enumerate(opps[:5]):
-                    log(f"  #{i+1}: {o['side']} {o['ticker']} "
-                        f"edge={o['adjusted_edge']:.1f}c conf={o['confidence']:.2f}")
+                best = opps[0]
+                lines = [f"Found {len(opps)} opportunities "
+                         f"(best: {best.city} edge={best.adjusted_edge:.1f}c)"]
+                for i in range(min(5, len(opps))):
+                    o = opps[i]
+                    lines.append(f"  #{i+1}: {o.side} {o.ticker} "
+                                 f"edge={o.adjusted_edge:.1f}c conf={o.confidence:.2f}")
+                log_many(lines)
                 execute_trades(opps, state)
             else:
                 log("No opportunities above threshold")
-
-            save_state(state)
         except Exception as e:
             log(f"ERROR in main loop: {e}")
             traceback.print_exc()
 
-        if PAPER_TRADING:
+        # End-of-tick state write (covers trades), whether or not the tick failed
+        try:
             save_state(state)
+        except Exception as e:
+            log(f"ERROR saving state: {e}")
+        flush_jsonl()
+        compact_pnl()
 
         interval = get_poll_interval()
-        log(f"Sleeping {interval // 60} min (smart poll)...")
-        time.sleep(interval)
+        if interval != last_interval:
+            if last_interval is not None:
+                # Entering or leaving a model-update window: new runs may be
+                # out, so don't let the next scan reuse cached forecasts
+                invalidate_forecast_cache()
+            last_interval = interval
+            poll_msg = f"Sleeping {interval // 60} min (smart poll)..."
+        log(poll_msg)
+        if _stop.wait(interval):
+            break
+
+    if _stop_signal is not None:
+        log(f"Received {signal.Signals(_stop_signal).name}, shutting down")
+    io_pool.shutdown()
+    compact_pnl(0)
+    log("Daemon stopped")
 
 
 if __name__ == '__main__':
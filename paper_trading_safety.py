@@ -4,21 +4,21 @@ Paper Trading Safety Module
 
 Provides safety wrappers for Kalshi trading functions to prevent accidental live trading.
 """
-import json
-from pathlib import Path
 from datetime import datetime, timezone
 
-PAPER_TRADES_PATH = Path(__file__).parent / "paper_trades.jsonl"
+from kalshi.logger import log_paper_trade as _append_paper_trade
 
 def log_paper_trade(action, **kwargs):
-    """Log a paper trade to JSONL file for later analysis."""
-    entry = {
+    """Log a paper trade to JSONL file for later analysis.
+
+    Goes through kalshi.logger's shared handle for paper_trades.jsonl, so
+    these lines and the executor's entries land in order.
+    """
+    _append_paper_trade({
         "ts": datetime.now(timezone.utc).isoformat(),
         "action": action,
         **kwargs
-    }
-    with open(PAPER_TRADES_PATH, 'a') as f:
-        f.write(json.dumps(entry, default=str) + '\n')
+    })
 
 def paper_place_order(ticker, side, count, price_cents):
     """
@@ -5,9 +5,12 @@ Each provider implements the same interface for easy swapping/comparison.
 """
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Tuple
 import logging
@@ -16,6 +19,12 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared keep-alive session for all providers.  Cities and providers are
+# fetched concurrently, and most providers share one Open-Meteo host, so
+# the pool is sized for that fan-out.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
 class WeatherProvider(ABC):
     """Abstract base class for weather data providers."""
     
@@ -23,6 +32,7 @@ class WeatherProvider(ABC):
         self.name = name
         self.last_request_time = 0
         self.rate_limit_delay = 0.3  # seconds between requests
+        self._rate_lock = threading.Lock()  # providers are shared across city threads
         
     @abstractmethod
     def get_forecast_high(self, location: Dict, target_date: datetime) -> Optional[float]:
@@ -30,11 +40,12 @@ class WeatherProvider(ABC):
         pass
         
     def _rate_limit(self):
-        """Basic rate limiting."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time = time.time()
+        """Basic rate limiting (thread-safe: callers queue on the lock)."""
+        with self._rate_lock:
+            elapsed = time.time() - self.last_request_time
+            if elapsed < self.rate_limit_delay:
+                time.sleep(self.rate_limit_delay - elapsed)
+            self.last_request_time = time.time()
 
 
 class NOAAProvider(WeatherProvider):
@@ -43,7 +54,20 @@ class NOAAProvider(WeatherProvider):
     def __init__(self):
         super().__init__("NOAA")
         self.base_url = "https://api.weather.gov"
-        self.last_update_time = None  # ISO string from most recent NOAA response
+        self._local = threading.local()
+
+    @property
+    def last_update_time(self) -> Optional[str]:
+        """ISO updateTime from this thread's most recent NOAA response.
+
+        Kept per-thread so concurrent city forecasts don't read each
+        other's staleness.
+        """
+        return getattr(self._local, 'last_update_time', None)
+
+    @last_update_time.setter
+    def last_update_time(self, value: Optional[str]):
+        self._local.last_update_time = value
 
     def get_forecast_high(self, location: Dict, target_date: datetime) -> Optional[float]:
         """Get NOAA forecast for target date."""
@@ -56,7 +80,7 @@ class NOAAProvider(WeatherProvider):
             url = f"{self.base_url}/gridpoints/{office}/{grid_x},{grid_y}/forecast"
             headers = {'User-Agent': 'KaelWeatherBot/2.0'}
 
-            response = requests.get(url, headers=headers, timeout=15)
+            response = _SESSION.get(url, headers=headers, timeout=15)
             response.raise_for_status()
 
             data = response.json()
@@ -107,7 +131,7 @@ class OpenMeteoGFSProvider(WeatherProvider):
                 'end_date': date_str,
                 'timezone': location.get('timezone', 'auto'),
             }
-            r = requests.get(self.base_url, params=params, timeout=15)
+            r = _SESSION.get(self.base_url, params=params, timeout=15)
             r.raise_for_status()
             temps = r.json().get('daily', {}).get('temperature_2m_max', [])
             if temps and temps[0] is not None:
@@ -139,7 +163,7 @@ class OpenMeteoICONProvider(WeatherProvider):
                 'end_date': date_str,
                 'timezone': location.get('timezone', 'auto'),
             }
-            r = requests.get(self.base_url, params=params, timeout=15)
+            r = _SESSION.get(self.base_url, params=params, timeout=15)
             r.raise_for_status()
             temps = r.json().get('daily', {}).get('temperature_2m_max', [])
             if temps and temps[0] is not None:
@@ -171,7 +195,7 @@ class OpenMeteoECMWFProvider(WeatherProvider):
                 'end_date': date_str,
                 'timezone': location.get('timezone', 'auto'),
             }
-            r = requests.get(self.base_url, params=params, timeout=15)
+            r = _SESSION.get(self.base_url, params=params, timeout=15)
             r.raise_for_status()
             temps = r.json().get('daily', {}).get('temperature_2m_max', [])
             if temps and temps[0] is not None:
@@ -203,7 +227,7 @@ class OpenMeteoGEMProvider(WeatherProvider):
                 'end_date': date_str,
                 'timezone': location.get('timezone', 'auto'),
             }
-            r = requests.get(self.base_url, params=params, timeout=15)
+            r = _SESSION.get(self.base_url, params=params, timeout=15)
             r.raise_for_status()
             temps = r.json().get('daily', {}).get('temperature_2m_max', [])
             if temps and temps[0] is not None:
@@ -243,7 +267,7 @@ class OpenWeatherMapProvider(WeatherProvider):
                 'exclude': 'current,minutely,hourly,alerts'
             }
             
-            response = requests.get(url, params=params, timeout=15)
+            response = _SESSION.get(url, params=params, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -302,7 +326,7 @@ class WeatherAPIProvider(WeatherProvider):
                 'alerts': 'no'
             }
             
-            response = requests.get(url, params=params, timeout=15)
+            response = _SESSION.get(url, params=params, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -350,9 +374,19 @@ class WeatherEnsemble:
         """
         forecasts = {}
         weights = {}
-        
-        for provider, base_weight in self.providers:
+
+        # Providers are independent HTTP round trips, so fetch them at once
+        def fetch(provider):
             forecast = provider.get_forecast_high(location, target_date)
+            return forecast, getattr(provider, 'last_update_time', None)
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.providers))) as ex:
+            results = list(ex.map(fetch, [provider for provider, _ in self.providers]))
+
+        for (provider, base_weight), (forecast, update_time) in zip(self.providers, results):
+            if isinstance(provider, NOAAProvider):
+                # updateTime is thread-local; hand it back to the calling thread
+                provider.last_update_time = update_time
             if forecast is not None:
                 # Apply model bias correction if available
                 if model_bias and city_code: